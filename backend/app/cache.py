@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after ttl seconds
+
+    Readers that fill the cache after a miss should take generation(key)
+    before loading the value and pass it to set(). A pop() in between,
+    i.e. a write committed while the value was being loaded, then makes
+    set() drop the possibly stale value instead of caching it.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        # pop() counts up _generation and records it per key, oldest first.
+        # At most maxsize keys are remembered; _forgotten is the newest
+        # generation dropped, and any read older than it is not cached.
+        self._generation = 0
+        self._popped = {}
+        self._forgotten = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def generation(self, key) -> int:
+        """Return the current generation, to pass to set() later"""
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, generation=None):
+        """Cache value, unless key was popped since generation was taken"""
+        with self._lock:
+            if generation is not None and (
+                    generation < self._forgotten
+                    or generation < self._popped.get(key, 0)):
+                return
+            now = time.monotonic()
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Drop expired entries first, then the oldest ones
+                self._data = {
+                    k: entry for k, entry in self._data.items()
+                    if entry[0] > now
+                }
+                while len(self._data) >= self.maxsize:
+                    del self._data[next(iter(self._data))]
+            self._data[key] = (now + self.ttl, value)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            # Re-insert so the dict stays ordered oldest pop first
+            self._popped.pop(key, None)
+            self._popped[key] = self._generation
+            if len(self._popped) > self.maxsize:
+                oldest = next(iter(self._popped))
+                self._forgotten = self._popped.pop(oldest)
+
+
+# Category and person names per user id. Every worker process keeps its own
+# copy, so entries also expire quickly in case another worker changed them:
+# a write made through another worker can go unseen here for up to ttl.
+user_categories_cache = TTLCache(ttl=30, maxsize=10_000)
+user_persons_cache = TTLCache(ttl=30, maxsize=10_000)
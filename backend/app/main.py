@@ -34,6 +34,47 @@ def _run_migrations(engine):
             conn.commit()
             logger.info("Migration applied: added email column to users table")
 
+        # Enforce the transaction type whitelist at the database level.
+        # NOT VALID skips re-checking existing rows, new writes are checked.
+        if engine.dialect.name == 'postgresql' and 'valid_transaction_type' not in [
+            con['name'] for con in inspector.get_check_constraints('transactions')
+        ]:
+            types = ", ".join(f"'{t}'" for t in models.TRANSACTION_TYPES)
+            conn.execute(text(
+                "ALTER TABLE transactions ADD CONSTRAINT valid_transaction_type "
+                f"CHECK (type IN ({types})) NOT VALID"))
+            conn.commit()
+            logger.info(
+                "Migration applied: added type check to transactions table")
+
+        # Create transaction indexes added after the table already existed
+        existing_indexes = {
+            index['name'] for index in inspector.get_indexes('transactions')
+        }
+        for index in models.Transaction.__table__.indexes:
+            if index.name not in existing_indexes:
+                index.create(conn)
+                conn.commit()
+                logger.info(f"Migration applied: created index {index.name}")
+
+        # Trigram index so the description substring filter can avoid a
+        # sequential scan. Needs the pg_trgm extension, which may require
+        # privileges the app user lacks, so failure only logs a warning.
+        if engine.dialect.name == 'postgresql' and \
+                'ix_transactions_description_trgm' not in existing_indexes:
+            try:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    "CREATE INDEX ix_transactions_description_trgm "
+                    "ON transactions USING gin (description gin_trgm_ops)"))
+                conn.commit()
+                logger.info("Migration applied: created index "
+                            "ix_transactions_description_trgm")
+            except Exception as e:
+                conn.rollback()
+                logger.warning(
+                    f"Could not create description trigram index: {e}")
+
 
 try:
     engine = init_database()
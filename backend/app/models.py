@@ -1,10 +1,12 @@
 from sqlalchemy import (
     Column, Integer, String, Float, Date, DateTime, ForeignKey, Boolean,
-    UniqueConstraint
+    UniqueConstraint, CheckConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from .database import Base
 
+TRANSACTION_TYPES = ('Income', 'Expense', 'Investment', 'Savings')
+
 
 class User(Base):
     __tablename__ = "users"
@@ -89,6 +91,15 @@ class Transaction(Base):
 
     user = relationship("User")
 
+    __table_args__ = (
+        CheckConstraint(
+            "type IN (%s)" % ", ".join(f"'{t}'" for t in TRANSACTION_TYPES),
+            name='valid_transaction_type'),
+        # Serve the per-user listing's default and amount sort orders
+        Index('ix_transactions_user_date', 'user_id', 'date'),
+        Index('ix_transactions_user_amount', 'user_id', 'amount'),
+    )
+
 
 class Receipt(Base):
     __tablename__ = "receipts"
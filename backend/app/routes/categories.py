@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from ..cache import user_categories_cache
 from ..database import get_db
 from ..models import Category as CategoryModel, User
 from ..schemas import CategoryCreate, Category as CategorySchema
@@ -50,6 +51,7 @@ def create_category(
     )
     db.add(db_category)
     db.commit()
+    user_categories_cache.pop(current_user.id)
     db.refresh(db_category)
     return db_category
 
@@ -95,6 +97,7 @@ def update_category(
 
     db_category.name = category.name
     db.commit()
+    user_categories_cache.pop(current_user.id)
     db.refresh(db_category)
     return db_category
 
@@ -124,4 +127,5 @@ def delete_category(
 
     db.delete(db_category)
     db.commit()
+    user_categories_cache.pop(current_user.id)
     return {"message": "Category deleted"}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from ..cache import user_persons_cache
 from ..database import get_db
 from ..models import Person as PersonModel, User
 from ..schemas import PersonCreate, Person as PersonSchema
@@ -50,6 +51,7 @@ def create_person(
     )
     db.add(db_person)
     db.commit()
+    user_persons_cache.pop(current_user.id)
     db.refresh(db_person)
     return db_person
 
@@ -95,6 +97,7 @@ def update_person(
 
     db_person.name = person.name
     db.commit()
+    user_persons_cache.pop(current_user.id)
     db.refresh(db_person)
     return db_person
 
@@ -124,4 +127,5 @@ def delete_person(
 
     db.delete(db_person)
     db.commit()
+    user_persons_cache.pop(current_user.id)
     return {"message": "Person deleted"}
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, and_, asc, desc
 from datetime import datetime, date, timedelta
 from typing import List, Optional
 import httpx
 import logging
+import orjson
 import io
 import csv
 from ..database import get_db, init_database
@@ -16,11 +17,35 @@ from .auth import get_current_user
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Every response on this router is rendered with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
 
 PDF_EXTRACTOR_URL = "http://91.98.45.199:8000/extract-batch"
 
 
+def parse_receipt_json(data: bytes) -> dict:
+    """Parse a PDF extractor response body.
+
+    Uses orjson rather than httpx's stdlib-based Response.json(); invalid
+    JSON raises orjson.JSONDecodeError, a ValueError subclass.
+    """
+    return orjson.loads(data)
+
+
+def _parse_iso_date(value: str) -> Optional[date]:
+    """Return the date for a zero-padded YYYY-MM-DD string, else None.
+
+    The extractor usually sends ISO dates, which date.fromisoformat handles
+    in C; other formats are left to the strptime fallbacks.
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
 def _normalize_totals(receipt_data: dict) -> tuple[float, float, float]:
     """Return sanitized (total, discount, paid) as non-null floats.
 
@@ -29,15 +54,6 @@ def _normalize_totals(receipt_data: dict) -> tuple[float, float, float]:
     - If discount is None, use max(total - total_paid, 0.0)
     - If paid is None, use (total - discount) with safe fallbacks
     """
-    products = receipt_data.get("products") or []
-    try:
-        products_sum = sum(
-            float(p.get("price") or 0) * float(p.get("quantity") or 0)
-            for p in products
-        )
-    except Exception:
-        products_sum = 0.0
-
     raw_total = receipt_data.get("total")
     raw_paid = receipt_data.get("total_paid")
     raw_discount = receipt_data.get("total_discount")
@@ -47,7 +63,18 @@ def _normalize_totals(receipt_data: dict) -> tuple[float, float, float]:
     total_discount = float(raw_discount) if raw_discount is not None else None
 
     if total is None:
-        if products_sum and products_sum > 0:
+        # Only needed without a total. A product that can't be read (not a
+        # dict, or a price/quantity that isn't a number) discards the whole
+        # sum rather than leaving a partial one
+        try:
+            products_sum = sum(
+                float(p.get("price") or 0) * float(p.get("quantity") or 0)
+                for p in receipt_data.get("products") or []
+            )
+        except (AttributeError, TypeError, ValueError):
+            products_sum = 0.0
+
+        if products_sum > 0:
             total = products_sum
         elif total_paid is not None:
             total = total_paid
@@ -140,7 +167,7 @@ async def upload_receipts(
         return results
 
     try:
-        extraction_result = response.json()
+        extraction_result = parse_receipt_json(response.content)
         logger.info(f"Batch extraction result: {extraction_result}")
     except Exception as e:
         logger.error(f"Failed to parse API response as JSON: {str(e)}")
@@ -202,7 +229,7 @@ async def upload_receipts(
 
             try:
                 date_str = receipt_data["date"]
-                receipt_date = None
+                receipt_date = _parse_iso_date(date_str)
 
                 date_formats = [
                     "%d/%m/%Y",
@@ -212,15 +239,16 @@ async def upload_receipts(
                     "%m-%d-%Y"
                 ]
 
-                for date_format in date_formats:
-                    try:
-                        receipt_date = datetime.strptime(
-                            date_str, date_format).date()
-                        logger.info(
-                            f"Successfully parsed date '{date_str}' using format '{date_format}' for {filename}")
-                        break
-                    except ValueError:
-                        continue
+                if receipt_date is None:
+                    for date_format in date_formats:
+                        try:
+                            receipt_date = datetime.strptime(
+                                date_str, date_format).date()
+                            logger.info(
+                                f"Successfully parsed date '{date_str}' using format '{date_format}' for {filename}")
+                            break
+                        except ValueError:
+                            continue
 
                 if receipt_date is None:
                     raise ValueError(
@@ -408,16 +436,17 @@ def get_monthly_summary(
     else:
         end_date = date(target_year, target_month + 1, 1) - timedelta(days=1)
 
-    receipts = db.query(Receipt).filter(
+    # Aggregate in the database instead of loading every receipt row
+    total_spent, receipt_count = db.query(
+        func.coalesce(func.sum(Receipt.total_paid), 0.0),
+        func.count(Receipt.id)
+    ).filter(
         and_(
             Receipt.user_id == current_user.id,
             Receipt.date >= start_date,
             Receipt.date <= end_date
         )
-    ).all()
-
-    total_spent = sum(receipt.total_paid for receipt in receipts)
-    receipt_count = len(receipts)
+    ).one()
     average_per_receipt = total_spent / receipt_count if receipt_count > 0 else 0
 
     category_totals = db.query(
@@ -469,16 +498,17 @@ def get_spending_summary(
             detail="Period must be 'week' or 'month'"
         )
 
-    receipts = db.query(Receipt).filter(
+    # Aggregate in the database instead of loading every receipt row
+    total_spent, receipt_count = db.query(
+        func.coalesce(func.sum(Receipt.total_paid), 0.0),
+        func.count(Receipt.id)
+    ).filter(
         and_(
             Receipt.user_id == current_user.id,
             Receipt.date >= start_date,
             Receipt.date <= end_date
         )
-    ).all()
-
-    total_spent = sum(receipt.total_paid for receipt in receipts)
-    receipt_count = len(receipts)
+    ).one()
     average_per_receipt = total_spent / receipt_count if receipt_count > 0 else 0
 
     category_totals = db.query(
@@ -633,7 +663,7 @@ async def process_pdf_content(
                     extracted_data=None
                 )
 
-            extraction_result = response.json()
+            extraction_result = parse_receipt_json(response.content)
             logger.info(f"Extraction result: {extraction_result}")
 
             if not extraction_result.get("results"):
@@ -682,20 +712,21 @@ async def process_pdf_content(
 
             try:
                 date_str = receipt_data["date"]
-                receipt_date = None
+                receipt_date = _parse_iso_date(date_str)
                 date_formats = [
                     "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"
                 ]
 
-                for date_format in date_formats:
-                    try:
-                        receipt_date = datetime.strptime(
-                            date_str, date_format).date()
-                        logger.info(
-                            f"Successfully parsed date '{date_str}' using format '{date_format}'")
-                        break
-                    except ValueError:
-                        continue
+                if receipt_date is None:
+                    for date_format in date_formats:
+                        try:
+                            receipt_date = datetime.strptime(
+                                date_str, date_format).date()
+                            logger.info(
+                                f"Successfully parsed date '{date_str}' using format '{date_format}'")
+                            break
+                        except ValueError:
+                            continue
 
                 if receipt_date is None:
                     raise ValueError(
@@ -865,7 +896,7 @@ async def process_pdf_batch(
                 return skipped_results + failed_results
 
             # Parse the response
-            extraction_result = response.json()
+            extraction_result = parse_receipt_json(response.content)
             logger.info(f"Extraction result: {extraction_result}")
 
             if not extraction_result.get("results"):
@@ -913,16 +944,17 @@ async def process_pdf_batch(
 
                 # Parse the date from various possible formats
                 date_str = receipt_data["date"]
-                receipt_date = None
-                for date_format in ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"]:
-                    try:
-                        receipt_date = datetime.strptime(
-                            date_str, date_format).date()
-                        logger.info(
-                            f"Successfully parsed date '{date_str}' using format '{date_format}'")
-                        break
-                    except ValueError:
-                        continue
+                receipt_date = _parse_iso_date(date_str)
+                if receipt_date is None:
+                    for date_format in ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"]:
+                        try:
+                            receipt_date = datetime.strptime(
+                                date_str, date_format).date()
+                            logger.info(
+                                f"Successfully parsed date '{date_str}' using format '{date_format}'")
+                            break
+                        except ValueError:
+                            continue
 
                 if not receipt_date:
                     logger.error(
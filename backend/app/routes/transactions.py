@@ -1,71 +1,222 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy import desc, asc, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..cache import user_categories_cache, user_persons_cache
 from ..database import get_db
 from ..models import (
     Transaction as TransactionModel, User, Category as CategoryModel,
-    Person as PersonModel
+    Person as PersonModel, TRANSACTION_TYPES
 )
 from ..schemas import TransactionCreate, Transaction as TransactionSchema
 from .auth import get_current_user
 import pandas as pd
-import io
-from datetime import datetime
-from typing import Optional
+import numpy as np
+from datetime import date, datetime
+from typing import BinaryIO, Iterator, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - pandas parser is used instead
+    pacsv = None
+
+# Every response on this router is rendered with orjson
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Valid transaction types (these remain static), built once at import
+VALID_TYPES = frozenset(TRANSACTION_TYPES)
+VALID_TYPES_TEXT = ', '.join(TRANSACTION_TYPES)
+
+# CSV import columns
+REQUIRED_COLUMNS = frozenset({'date', 'type',
+                              'category', 'description', 'amount'})
+OPTIONAL_COLUMNS = frozenset({'person'})
+ALL_VALID_COLUMNS = REQUIRED_COLUMNS | OPTIONAL_COLUMNS
+
+# A UTC offset (or Z) trailing a time of day, e.g. the "+01:00" in
+# "2024-01-01T00:00:00+01:00"; group 1 is the time that is kept
+UTC_OFFSET_PATTERN = r'(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)\s*(?:Z|[+-]\d{2}(?::?\d{2})?)$'
+
+# Columns GET /transactions/ can sort by
+SORT_COLUMNS = {
+    'date': TransactionModel.date,
+    'amount': TransactionModel.amount,
+    'type': TransactionModel.type,
+    'category': TransactionModel.category,
+    'person': TransactionModel.person,
+    'description': TransactionModel.description,
+}
+
+# Model columns in TransactionSchema field order, for list responses
+# built straight from rows
+TRANSACTION_COLUMNS = tuple(
+    getattr(TransactionModel, field) for field in TransactionSchema.model_fields)
+
+# Page size bounds for GET /transactions/ when paginating
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 1000
+
+# Rows per INSERT executemany batch when importing CSV files
+IMPORT_BATCH_SIZE = 1000
+
+# CSV imports are parsed, validated and stored a piece at a time so peak
+# memory follows the chunk size rather than the upload size
+IMPORT_CHUNK_ROWS = 10_000
+IMPORT_BLOCK_BYTES = 1 << 20
+
+# Upper bounds on the preview response size
+PREVIEW_MAX_ROWS = 500
+PREVIEW_MAX_ERRORS = 200
+
+
+def _get_user_names(db: Session, model, cache, user_id: int) -> tuple[str, ...]:
+    """Get a user's category or person names in creation order, cached
+
+    Writers pop the cache after committing; the generation check keeps a
+    read that raced such a write from caching the names it loaded before
+    the commit. Writes made through another worker process are still only
+    seen once this process's entry expires.
+    """
+    names = cache.get(user_id)
+    if names is None:
+        generation = cache.generation(user_id)
+        # Only the names are needed, so skip building ORM objects
+        names = tuple(db.scalars(select(model.name).where(
+            model.user_id == user_id
+        ).order_by(model.id)))
+        cache.set(user_id, names, generation)
+    return names
+
+
+def get_user_categories(db: Session, user_id: int) -> tuple[str, ...]:
+    """Get all category names for a user"""
+    return _get_user_names(db, CategoryModel, user_categories_cache, user_id)
+
+
+def get_user_persons(db: Session, user_id: int) -> tuple[str, ...]:
+    """Get all person names for a user"""
+    return _get_user_names(db, PersonModel, user_persons_cache, user_id)
+
+
+def _insert_names(db: Session, model, user_id: int, names: list[str]):
+    """Insert non-default name rows for a user in a single statement.
+
+    On PostgreSQL, rows that already exist (e.g. created by a concurrent
+    request) are skipped via ON CONFLICT DO NOTHING.
+    """
+    if not names:
+        return
+    if db.get_bind().dialect.name == 'postgresql':
+        stmt = pg_insert(model).on_conflict_do_nothing()
+    else:
+        stmt = insert(model)
+    db.execute(stmt, [
+        {'name': name, 'user_id': user_id, 'is_default': False}
+        for name in names
+    ])
 
-router = APIRouter()
 
+def create_categories_if_not_exist(db: Session, user_id: int, category_names: list[str]):
+    """Create the given categories for the user, skipping existing ones"""
+    _insert_names(db, CategoryModel, user_id, category_names)
 
-def get_user_categories(db: Session, user_id: int):
-    """Get all categories for a user as a set of names"""
-    categories = db.query(CategoryModel).filter(
-        CategoryModel.user_id == user_id
-    ).all()
-    return {cat.name for cat in categories}
 
+def create_persons_if_not_exist(db: Session, user_id: int, person_names: list[str]):
+    """Create the given persons for the user, skipping existing ones"""
+    _insert_names(db, PersonModel, user_id, person_names)
 
-def get_user_persons(db: Session, user_id: int):
-    """Get all persons for a user as a set of names"""
-    persons = db.query(PersonModel).filter(
-        PersonModel.user_id == user_id
-    ).all()
-    return {person.name for person in persons}
 
+def iter_csv_chunks(file: BinaryIO) -> Iterator[pd.DataFrame]:
+    """Parse a CSV upload incrementally, yielding one DataFrame per chunk.
+
+    Uses pyarrow's streaming reader when it is installed, falling back to
+    pandas' chunked reader otherwise. With pyarrow all columns are read as
+    strings so bad values are reported per row by _validate_df instead of
+    failing the whole parse.
+    """
+    if pacsv is None:
+        yield from pd.read_csv(file, chunksize=IMPORT_CHUNK_ROWS)
+        return
+    reader = pacsv.open_csv(
+        file,
+        read_options=pacsv.ReadOptions(block_size=IMPORT_BLOCK_BYTES),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={column: pa.string() for column in ALL_VALID_COLUMNS},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def count_csv_rows(file: BinaryIO) -> int:
+    """Count the data rows left in a CSV upload without keeping them.
+
+    Only the date column is converted, and only a chunk at a time, so
+    counting stays cheap in time and memory. Quoted newlines are handled
+    the same way as by iter_csv_chunks.
+    """
+    if pacsv is None:
+        return sum(len(chunk) for chunk in pd.read_csv(
+            file, usecols=['date'], chunksize=IMPORT_CHUNK_ROWS))
+    reader = pacsv.open_csv(
+        file,
+        read_options=pacsv.ReadOptions(block_size=IMPORT_BLOCK_BYTES),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=['date'], column_types={'date': pa.string()}),
+    )
+    return sum(batch.num_rows for batch in reader)
 
-def create_category_if_not_exists(db: Session, user_id: int, category_name: str):
-    """Create a new category for the user if it doesn't exist"""
-    existing = db.query(CategoryModel).filter(
-        CategoryModel.user_id == user_id,
-        CategoryModel.name == category_name
-    ).first()
 
-    if not existing:
-        new_category = CategoryModel(
-            name=category_name,
-            user_id=user_id,
-            is_default=False
+def validate_csv_header(file: BinaryIO):
+    """Validate the CSV columns from the header row alone.
+
+    Only the header is parsed, so malformed uploads are rejected without
+    paying for a full parse of the file body. The file is rewound
+    afterwards so it can be parsed from the start.
+    """
+    try:
+        columns = set(pd.read_csv(file, nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="CSV file is empty")
+    file.seek(0)
+
+    # Check if required columns exist
+    missing_columns = REQUIRED_COLUMNS - columns
+    if missing_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing required columns: {', '.join(missing_columns)}"
         )
-        db.add(new_category)
-        return new_category
-    return existing
-
-
-def create_person_if_not_exists(db: Session, user_id: int, person_name: str):
-    """Create a new person for the user if it doesn't exist"""
-    existing = db.query(PersonModel).filter(
-        PersonModel.user_id == user_id,
-        PersonModel.name == person_name
-    ).first()
-
-    if not existing:
-        new_person = PersonModel(
-            name=person_name,
-            user_id=user_id,
-            is_default=False
+
+    # Check for any unexpected columns
+    unexpected_columns = columns - ALL_VALID_COLUMNS
+    if unexpected_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unexpected columns found: {', '.join(unexpected_columns)}. Expected columns: {', '.join(ALL_VALID_COLUMNS)}"
         )
-        db.add(new_person)
-        return new_person
-    return existing
+
+
+def _parse_iso_date(value: str) -> date:
+    """Parse a YYYY-MM-DD date, raising ValueError if it is invalid.
+
+    Zero-padded dates take the C-level date.fromisoformat path; anything
+    else falls back to strptime, which also accepts e.g. 2024-1-5.
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return date.fromisoformat(value)
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
 
 
 @router.get("/categories", response_model=list[str])
@@ -74,10 +225,7 @@ def get_transaction_categories(
     current_user: User = Depends(get_current_user)
 ):
     """Get all categories for the current user"""
-    categories = db.query(CategoryModel).filter(
-        CategoryModel.user_id == current_user.id
-    ).all()
-    return [cat.name for cat in categories]
+    return list(get_user_categories(db, current_user.id))
 
 
 @router.get("/persons", response_model=list[str])
@@ -86,10 +234,7 @@ def get_transaction_persons(
     current_user: User = Depends(get_current_user)
 ):
     """Get all persons for the current user"""
-    persons = db.query(PersonModel).filter(
-        PersonModel.user_id == current_user.id
-    ).all()
-    return [person.name for person in persons]
+    return list(get_user_persons(db, current_user.id))
 
 
 @router.get("/", response_model=list[TransactionSchema])
@@ -107,7 +252,10 @@ def get_transactions(
     amount_max: Optional[float] = None,
     # Sort parameters
     sort_by: Optional[str] = 'date',
-    sort_direction: Optional[str] = 'desc'
+    sort_direction: Optional[str] = 'desc',
+    # Pagination parameters
+    page: Optional[int] = None,
+    per_page: Optional[int] = None
 ):
     """
     Get transactions with optional filtering and sorting.
@@ -125,22 +273,28 @@ def get_transactions(
     Sort parameters:
     - sort_by: Field to sort by (date, amount, type, category, person, description)
     - sort_direction: Sort direction (asc, desc)
+
+    Pagination parameters:
+    - page: 1-based page number
+    - per_page: Transactions per page (default 100, max 1000)
+
+    Without page or per_page every matching transaction is returned.
     """
-    query = db.query(TransactionModel).filter(
+    query = db.query(*TRANSACTION_COLUMNS).filter(
         TransactionModel.user_id == current_user.id
     )
 
     # Apply filters
     if date_from:
         try:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
+            date_from_obj = _parse_iso_date(date_from)
             query = query.filter(TransactionModel.date >= date_from_obj)
         except ValueError:
             pass  # Invalid date format, ignore filter
 
     if date_to:
         try:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
+            date_to_obj = _parse_iso_date(date_to)
             query = query.filter(TransactionModel.date <= date_to_obj)
         except ValueError:
             pass  # Invalid date format, ignore filter
@@ -155,8 +309,8 @@ def get_transactions(
         query = query.filter(TransactionModel.person == person)
 
     if description:
-        query = query.filter(
-            TransactionModel.description.ilike(f'%{description}%'))
+        query = query.filter(TransactionModel.description.ilike(
+            f'%{_escape_like(description)}%', escape='\\'))
 
     if amount_min is not None:
         query = query.filter(TransactionModel.amount >= amount_min)
@@ -165,24 +319,35 @@ def get_transactions(
         query = query.filter(TransactionModel.amount <= amount_max)
 
     # Apply sorting
-    sort_field = getattr(TransactionModel, sort_by, TransactionModel.date)
-    if sort_direction == 'desc':
-        query = query.order_by(desc(sort_field))
-    else:
-        query = query.order_by(asc(sort_field))
+    sort_field = SORT_COLUMNS.get(sort_by, TransactionModel.date)
+    order_func = desc if sort_direction == 'desc' else asc
+    # id breaks ties so pages don't overlap or skip rows
+    query = query.order_by(order_func(sort_field), order_func(TransactionModel.id))
 
-    transactions = query.all()
-    return transactions
+    if page is not None or per_page is not None:
+        page = max(1, 1 if page is None else page)
+        if per_page is None:
+            per_page = DEFAULT_PER_PAGE
+        per_page = min(max(1, per_page), MAX_PER_PAGE)
+        query = query.offset((page - 1) * per_page).limit(per_page)
+
+    # Rows come from typed columns, so hand them to orjson directly rather
+    # than building ORM objects and re-validating them against the schema
+    return ORJSONResponse([row._asdict() for row in query])
 
 
 @router.post("/", response_model=TransactionSchema)
 def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_transaction = TransactionModel(
-        **transaction.dict(), user_id=current_user.id)
-    db.add(db_transaction)
+    # INSERT ... RETURNING hands back the new row in the same round-trip,
+    # so no refresh SELECT is needed after the commit
+    stmt = insert(TransactionModel).values(
+        **transaction.model_dump(), user_id=current_user.id
+    ).returning(TransactionModel)
+    db_transaction = db.execute(stmt).scalar_one()
+    # Serialize before commit() expires the instance's attributes
+    result = TransactionSchema.model_validate(db_transaction)
     db.commit()
-    db.refresh(db_transaction)
-    return db_transaction
+    return result
 
 
 @router.put("/{transaction_id}", response_model=TransactionSchema)
@@ -209,9 +374,175 @@ def delete_transaction(transaction_id: int, db: Session = Depends(get_db), curre
     return {"message": "Transaction deleted"}
 
 
+def _parse_amounts(amounts: pd.Series) -> pd.Series:
+    """Convert an amount column to float, with NaN for missing/invalid values.
+
+    Text columns, whether object or string dtype, are first cast in one
+    pass by pyarrow, which fails on any non-numeric value; only then does
+    pandas' slower, per-value coercion run. Both paths pass "inf", "nan" and overflowing values such as
+    "1e400" through as non-finite floats, so callers must reject those.
+    """
+    if pacsv is not None and not pd.api.types.is_numeric_dtype(amounts):
+        try:
+            values = pc.cast(
+                pa.array(amounts, type=pa.string(), from_pandas=True),
+                pa.float64()).to_numpy(zero_copy_only=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        else:
+            return pd.Series(values, index=amounts.index)
+    return pd.to_numeric(amounts, errors='coerce').astype(float)
+
+
+def _parse_dates(values: pd.Series, date_format: str) -> pd.Series:
+    """Parse date strings to naive datetime64, NaT where they don't parse.
+
+    utc=True keeps any offset the pattern missed from producing an object
+    column; offset-free values are left at their wall-clock time.
+    """
+    dates = pd.to_datetime(
+        values, format=date_format, errors='coerce', utc=True)
+    return dates.dt.tz_localize(None)
+
+
+def _validate_df(df: pd.DataFrame, first_row: int = 2) -> tuple[list[dict], list[str]]:
+    """Validate parsed CSV rows.
+
+    Returns (valid_transactions, errors). Valid transactions carry a
+    datetime.date and a float amount; errors are "Row N: ..." messages
+    where N is the line number in the file, counting from first_row for
+    the first row of df.
+
+    Every check runs on whole columns at once; Python-level work is only
+    done for the rows that actually have errors.
+    """
+    # Strip every text column once up front; the checks below and the
+    # returned rows all work from these
+    stripped = {
+        column: df[column].astype(str).str.strip()
+        for column in ('date', 'type', 'person', 'category', 'description')
+        if column in df.columns
+    }
+
+    def is_blank(column):
+        return df[column].isna() | stripped[column].eq('')
+
+    # Missing, empty or blank persons default to 'Family'
+    if 'person' in df.columns:
+        person = stripped['person'].mask(is_blank('person'), 'Family')
+    else:
+        person = pd.Series('Family', index=df.index, dtype=object)
+
+    # Parse dates with the ISO fast path, retrying anything else per value.
+    # Offsets are dropped first so every row keeps its own wall-clock date,
+    # as Timestamp.date() did, and the column stays naive datetime64 even
+    # when a file mixes offsets, or offsets and plain dates
+    date_missing = is_blank('date')
+    date_text = stripped['date'].str.replace(
+        UTC_OFFSET_PATTERN, r'\1', regex=True)
+    dates = _parse_dates(date_text, 'ISO8601')
+    retry = dates.isna() & ~date_missing
+    if retry.any():
+        dates = dates.mask(retry, _parse_dates(date_text[retry], 'mixed'))
+    date_invalid = dates.isna() & ~date_missing
+
+    type_missing = is_blank('type')
+    type_invalid = ~type_missing & ~df['type'].isin(VALID_TYPES)
+
+    amount_missing = df['amount'].isna()
+    amounts = _parse_amounts(df['amount'])
+    # NaN covers unparseable values too; inf and "nan" are never stored
+    amount_invalid = ~np.isfinite(amounts) & ~amount_missing
+
+    # (mask, message) pairs in the order errors are reported within a row
+    checks = [
+        (date_missing, "Date is required"),
+        (date_invalid,
+         "Invalid date format. Expected YYYY-MM-DD or similar parseable format"),
+        (type_missing, "Type is required"),
+        (type_invalid, lambda mask: "Invalid type '" + df['type'][mask].astype(str)
+         + f"'. Must be one of: {VALID_TYPES_TEXT}"),
+        (is_blank('category'), "Category is required"),
+        (is_blank('description'), "Description is required"),
+        (amount_missing, "Amount is required"),
+        (amount_invalid, "Amount must be a valid number"),
+    ]
+    flags = np.column_stack([mask.to_numpy() for mask, _ in checks])
+
+    columns = {
+        'date': dates,
+        'type': stripped['type'],
+        'person': person,
+        'category': stripped['category'],
+        'description': stripped['description'],
+        'amount': amounts,
+    }
+    errors = []
+    # Clean files skip building messages and filtering rows entirely
+    if flags.any():
+        row_prefix = "Row " + pd.Series(
+            np.arange(first_row, first_row + len(df)), index=df.index).astype(str) + ": "
+        messages = np.empty(flags.shape, dtype=object)
+        for position, (mask, message) in enumerate(checks):
+            if mask.any():
+                text = message(mask) if callable(message) else message
+                messages[mask.to_numpy(), position] = (
+                    row_prefix[mask] + text).to_numpy()
+        # Boolean indexing walks the grid row by row, keeping file order
+        errors = messages[flags].tolist()
+
+        valid = ~flags.any(axis=1)
+        columns = {key: column[valid] for key, column in columns.items()}
+
+    # Build one datetime.date per distinct day and share it between rows,
+    # since exports repeat the same few dates many times
+    codes, unique_dates = pd.factorize(columns['date'])
+    columns['date'] = np.asarray(unique_dates.date, dtype=object)[codes]
+
+    # Zipping plain lists avoids DataFrame.to_dict's per-cell boxing
+    keys = tuple(columns)
+    valid_transactions = [
+        dict(zip(keys, row))
+        for row in zip(*(column.tolist() for column in columns.values()))
+    ]
+
+    return valid_transactions, errors
+
+
+def _store_transactions(db: Session, user_id: int, valid_transactions: list[dict],
+                        user_categories: set[str], user_persons: set[str]):
+    """Insert validated transactions, creating missing categories/persons.
+
+    user_categories and user_persons are updated in place with the names
+    created, so they stay current across chunks of the same import.
+    """
+    # dict.fromkeys de-duplicates while keeping first-seen file order
+    new_categories = [
+        name for name in dict.fromkeys(t['category'] for t in valid_transactions)
+        if name not in user_categories]
+    new_persons = [
+        name for name in dict.fromkeys(t['person'] for t in valid_transactions)
+        if name not in user_persons]
+    create_categories_if_not_exist(db, user_id, new_categories)
+    create_persons_if_not_exist(db, user_id, new_persons)
+    user_categories.update(new_categories)
+    user_persons.update(new_persons)
+
+    # One executemany per batch instead of an ORM object per row
+    for start in range(0, len(valid_transactions), IMPORT_BATCH_SIZE):
+        db.execute(insert(TransactionModel), [
+            {**transaction_data, 'user_id': user_id}
+            for transaction_data in
+            valid_transactions[start:start + IMPORT_BATCH_SIZE]
+        ])
+
+
+# Sync on purpose: FastAPI runs it in the threadpool, keeping the CSV
+# parsing and database work off the event loop
 @router.post("/import-csv")
-async def import_csv_transactions(
+def import_csv_transactions(
     file: UploadFile = File(...),
+    include_sample: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -225,6 +556,9 @@ async def import_csv_transactions(
     - category (required): Transaction category
     - description (required): Transaction description
     - amount (required): Transaction amount (negative for expenses, positive for income)
+
+    With include_sample=true the response also carries the first 3
+    imported transactions as sample_data.
     """
 
     # Validate file type
@@ -232,152 +566,65 @@ async def import_csv_transactions(
         raise HTTPException(status_code=400, detail="File must be a CSV file")
 
     try:
-        # Read the CSV file
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-
-        # Validate required columns
-        required_columns = {'date', 'type',
-                            'category', 'description', 'amount'}
-        optional_columns = {'person'}
-        all_valid_columns = required_columns | optional_columns
-
-        # Check if required columns exist
-        missing_columns = required_columns - set(df.columns)
-        if missing_columns:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required columns: {', '.join(missing_columns)}"
-            )
-
-        # Check for any unexpected columns
-        unexpected_columns = set(df.columns) - all_valid_columns
-        if unexpected_columns:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unexpected columns found: {', '.join(unexpected_columns)}. Expected columns: {', '.join(all_valid_columns)}"
-            )
-
-        # Add default 'person' column if not present
-        if 'person' not in df.columns:
-            df['person'] = 'Family'
-        else:
-            # Fill empty person values with 'Family'
-            df['person'] = df['person'].fillna('Family')
-            df.loc[df['person'].str.strip() == '', 'person'] = 'Family'
+        # Check the header, then stream the body straight from the spooled
+        # upload instead of reading it into memory first
+        validate_csv_header(file.file)
 
-        # Validate and process data
+        total_rows = 0
+        valid_count = 0
         errors = []
-        valid_transactions = []
-        # Get user's current categories and persons
-        user_categories = get_user_categories(db, current_user.id)
-        user_persons = get_user_persons(db, current_user.id)
-        # Valid transaction types (these remain static)
-        valid_types = {'Income', 'Expense', 'Investment', 'Savings'}
-
-        for index, row in df.iterrows():
-            row_num = index + 2  # +2 because index starts at 0 and we have a header row
-            row_errors = []
-
-            # Validate date
-            try:
-                if pd.isna(row['date']) or str(row['date']).strip() == '':
-                    row_errors.append(f"Row {row_num}: Date is required")
-                else:
-                    parsed_date = pd.to_datetime(row['date']).date()
-            except Exception:
-                row_errors.append(
-                    f"Row {row_num}: Invalid date format. Expected YYYY-MM-DD or similar parseable format")
-
-            # Validate type
-            if pd.isna(row['type']) or str(row['type']).strip() == '':
-                row_errors.append(f"Row {row_num}: Type is required")
-            elif row['type'] not in valid_types:
-                row_errors.append(
-                    f"Row {row_num}: Invalid type '{row['type']}'. Must be one of: {', '.join(valid_types)}")
-
-            # Validate category (create if doesn't exist)
-            if pd.isna(row['category']) or str(row['category']).strip() == '':
-                row_errors.append(f"Row {row_num}: Category is required")
-            else:
-                # Create category if it doesn't exist
-                category_name = str(row['category']).strip()
-                if category_name not in user_categories:
-                    create_category_if_not_exists(
-                        db, current_user.id, category_name)
-                    user_categories.add(category_name)  # Update the set
-
-            # Validate person (create if doesn't exist)
-            if not pd.isna(row['person']) and str(row['person']).strip() != '':
-                person_name = str(row['person']).strip()
-                if person_name not in user_persons:
-                    create_person_if_not_exists(
-                        db, current_user.id, person_name)
-                    user_persons.add(person_name)  # Update the set
-
-            # Validate description
-            if pd.isna(row['description']) or str(row['description']).strip() == '':
-                row_errors.append(f"Row {row_num}: Description is required")
-
-            # Validate amount
-            try:
-                if pd.isna(row['amount']):
-                    row_errors.append(f"Row {row_num}: Amount is required")
-                else:
-                    amount = float(row['amount'])
-            except (ValueError, TypeError):
-                row_errors.append(
-                    f"Row {row_num}: Amount must be a valid number")
-
-            # If there are errors for this row, add them to the errors list
-            if row_errors:
-                errors.extend(row_errors)
-            else:
-                # Create transaction data
-                transaction_data = {
-                    'date': parsed_date,
-                    'type': str(row['type']).strip(),
-                    'person': str(row['person']).strip(),
-                    'category': str(row['category']).strip(),
-                    'description': str(row['description']).strip(),
-                    'amount': amount
-                }
-                valid_transactions.append(transaction_data)
+        sample_data = []
+        user_categories = set(get_user_categories(db, current_user.id))
+        user_persons = set(get_user_persons(db, current_user.id))
+        for df in iter_csv_chunks(file.file):
+            # Validate and process data
+            valid_transactions, chunk_errors = _validate_df(
+                df, first_row=total_rows + 2)
+            total_rows += len(df)
+            valid_count += len(valid_transactions)
+            errors.extend(chunk_errors)
+            # Once any row has failed nothing will be committed, so only
+            # keep validating to report every error
+            if errors:
+                continue
+
+            _store_transactions(db, current_user.id, valid_transactions,
+                                user_categories, user_persons)
+            if include_sample:
+                sample_data.extend(valid_transactions[:3 - len(sample_data)])
 
         # If there are validation errors, return them
         if errors:
+            db.rollback()
             raise HTTPException(
                 status_code=400,
                 detail={
                     "message": "CSV validation failed",
                     "errors": errors,
-                    "valid_rows": len(valid_transactions),
-                    "total_rows": len(df)
+                    "valid_rows": valid_count,
+                    "total_rows": total_rows
                 }
             )
 
         # If no valid transactions, return error
-        if not valid_transactions:
+        if not valid_count:
             raise HTTPException(
                 status_code=400, detail="No valid transactions found in CSV file")
 
-        # Save transactions to database
-        created_transactions = []
-        for transaction_data in valid_transactions:
-            db_transaction = TransactionModel(
-                **transaction_data, user_id=current_user.id)
-            db.add(db_transaction)
-            created_transactions.append(transaction_data)
-
         db.commit()
-
-        return {
-            "message": f"Successfully imported {len(created_transactions)} transactions",
-            "imported_count": len(created_transactions),
-            "total_rows": len(df),
-            # Show first 3 transactions as preview
-            "sample_data": created_transactions[:3]
+        # The import may have created categories/persons
+        user_categories_cache.pop(current_user.id)
+        user_persons_cache.pop(current_user.id)
+
+        result = {
+            "message": f"Successfully imported {valid_count} transactions",
+            "imported_count": valid_count,
+            "total_rows": total_rows,
         }
+        if include_sample:
+            # orjson serializes the datetime.date values natively
+            result["sample_data"] = sample_data
+        return ORJSONResponse(result)
 
     except HTTPException:
         # Re-raise HTTPExceptions (validation errors)
@@ -390,8 +637,10 @@ async def import_csv_transactions(
         )
 
 
+# Sync on purpose: FastAPI runs it in the threadpool, keeping the CSV
+# parsing and database work off the event loop
 @router.post("/preview-csv")
-async def preview_csv_transactions(
+def preview_csv_transactions(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -399,6 +648,12 @@ async def preview_csv_transactions(
     """
     Preview transactions from a CSV file without importing them.
     This endpoint validates the CSV and returns the parsed transactions for review.
+
+    Only the first PREVIEW_MAX_ROWS rows are validated and at most
+    PREVIEW_MAX_ERRORS error messages are returned; `truncated` is set
+    when either limit was hit. `total_rows` counts every row in the file,
+    while `preview_rows`, `valid_count` and `error_count` only cover the
+    validated rows.
     """
 
     # Validate file type
@@ -406,119 +661,34 @@ async def preview_csv_transactions(
         raise HTTPException(status_code=400, detail="File must be a CSV file")
 
     try:
-        # Read the CSV file
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-
-        # Validate required columns
-        required_columns = {'date', 'type',
-                            'category', 'description', 'amount'}
-        optional_columns = {'person'}
-        all_valid_columns = required_columns | optional_columns
-
-        # Check if required columns exist
-        missing_columns = required_columns - set(df.columns)
-        if missing_columns:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required columns: {', '.join(missing_columns)}"
-            )
-
-        # Check for any unexpected columns
-        unexpected_columns = set(df.columns) - all_valid_columns
-        if unexpected_columns:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unexpected columns found: {', '.join(unexpected_columns)}. Expected columns: {', '.join(all_valid_columns)}"
-            )
-
-        # Add default 'person' column if not present
-        if 'person' not in df.columns:
-            df['person'] = 'Family'
-        else:
-            # Fill empty person values with 'Family'
-            df['person'] = df['person'].fillna('Family')
-            df.loc[df['person'].str.strip() == '', 'person'] = 'Family'
-
-        # Validate and process data
-        errors = []
-        valid_transactions = []
-
-        # Valid transaction types and categories (dynamic from user's data)
-        valid_types = {'Income', 'Expense', 'Investment', 'Savings'}
-        # Note: For preview, we'll show warnings for unknown categories/persons
-        # but won't create them yet - that happens during actual import
-        user_categories = get_user_categories(db, current_user.id)
-        user_persons = get_user_persons(db, current_user.id)
-
-        for index, row in df.iterrows():
-            row_num = index + 2  # +2 because index starts at 0 and we have a header row
-            row_errors = []
-
-            # Validate date
-            try:
-                if pd.isna(row['date']) or str(row['date']).strip() == '':
-                    row_errors.append(f"Row {row_num}: Date is required")
-                else:
-                    parsed_date = pd.to_datetime(row['date']).date()
-            except Exception:
-                row_errors.append(
-                    f"Row {row_num}: Invalid date format. Expected YYYY-MM-DD or similar parseable format")
-
-            # Validate type
-            if pd.isna(row['type']) or str(row['type']).strip() == '':
-                row_errors.append(f"Row {row_num}: Type is required")
-            elif row['type'] not in valid_types:
-                row_errors.append(
-                    f"Row {row_num}: Invalid type '{row['type']}'. Must be one of: {', '.join(valid_types)}")
-
-            # Validate category (warn for unknown categories)
-            if pd.isna(row['category']) or str(row['category']).strip() == '':
-                row_errors.append(f"Row {row_num}: Category is required")
-            else:
-                category_name = str(row['category']).strip()
-                if category_name not in user_categories:
-                    # For preview, we'll show this as a warning but not an error
-                    # The category will be created during actual import
-                    pass
-
-            # Validate description
-            if pd.isna(row['description']) or str(row['description']).strip() == '':
-                row_errors.append(f"Row {row_num}: Description is required")
-
-            # Validate amount
-            try:
-                if pd.isna(row['amount']):
-                    row_errors.append(f"Row {row_num}: Amount is required")
-                else:
-                    amount = float(row['amount'])
-            except (ValueError, TypeError):
-                row_errors.append(
-                    f"Row {row_num}: Amount must be a valid number")
-
-            # If there are errors for this row, add them to the errors list
-            if row_errors:
-                errors.extend(row_errors)
-            else:
-                # Create transaction data
-                transaction_data = {
-                    'date': str(parsed_date),
-                    'type': str(row['type']).strip(),
-                    'person': str(row['person']).strip(),
-                    'category': str(row['category']).strip(),
-                    'description': str(row['description']).strip(),
-                    'amount': amount
-                }
-                valid_transactions.append(transaction_data)
+        # Check the header, then parse straight from the spooled upload
+        validate_csv_header(file.file)
+        # Parse one extra row so we can tell whether the file was cut short
+        df = pd.read_csv(file.file, nrows=PREVIEW_MAX_ROWS + 1)
+        rows_truncated = len(df) > PREVIEW_MAX_ROWS
+        df = df.iloc[:PREVIEW_MAX_ROWS]
+        total_rows = len(df)
+        if rows_truncated:
+            # Count the whole file without parsing it into a DataFrame
+            file.file.seek(0)
+            total_rows = count_csv_rows(file.file)
+
+        # Validate and process data. Unknown categories/persons are not an
+        # error here - they are created during the actual import
+        valid_transactions, errors = _validate_df(df)
+        for transaction_data in valid_transactions:
+            transaction_data['date'] = transaction_data['date'].isoformat()
 
         # Return preview data (even if there are some errors)
-        return {
+        return ORJSONResponse({
             "valid_transactions": valid_transactions,
-            "errors": errors,
-            "total_rows": len(df),
+            "errors": errors[:PREVIEW_MAX_ERRORS],
+            "total_rows": total_rows,
+            "preview_rows": len(df),
             "valid_count": len(valid_transactions),
-            "error_count": len(errors)
-        }
+            "error_count": len(errors),
+            "truncated": rows_truncated or len(errors) > PREVIEW_MAX_ERRORS
+        })
 
     except HTTPException:
         # Re-raise HTTPExceptions (validation errors)
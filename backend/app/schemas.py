@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import Optional, List
+from typing import Literal, Optional, List
+
+from .models import TRANSACTION_TYPES
 
 
 class UserBase(BaseModel):
@@ -64,7 +66,9 @@ class TransactionBase(BaseModel):
 
 
 class TransactionCreate(TransactionBase):
-    pass
+    # Rejected with a 422 here rather than by the valid_transaction_type
+    # CHECK at commit time
+    type: Literal[*TRANSACTION_TYPES]
 
 
 class Transaction(TransactionBase):
@@ -60,7 +60,7 @@ export const transactionApi = {
   importCsv: (file: File) => {
     const formData = new FormData();
     formData.append('file', file);
-    return api.post('/transactions/import-csv', formData, {
+    return api.post('/transactions/import-csv?include_sample=true', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -0,0 +1,225 @@
+import os
+import sys
+import pytest
+import requests
+from pathlib import Path
+from types import MappingProxyType
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Load environment variables
+load_dotenv()
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+# Make the backend's `app` package and the shared settings module
+# importable for every test module, whatever pytest's import mode
+sys.path.insert(0, str(TESTS_DIR.parent / "backend"))
+sys.path.insert(0, str(TESTS_DIR))
+
+from settings import CREDENTIALS, LOGIN_URL, REGISTER_URL  # noqa: E402
+
+# Importing the backend routes needs a JWT secret; the unit tests never
+# sign tokens, so any value will do when the environment doesn't set one
+os.environ.setdefault("JWT_SECRET", "test-secret-for-import-only")
+
+# Connection settings for the test database, read once per session and
+# read-only so no test can change them for the others
+DB_PARAMS = MappingProxyType({
+    'host': os.getenv('POSTGRES_HOST'),
+    'port': os.getenv('POSTGRES_PORT'),
+    'database': os.getenv('POSTGRES_DB'),
+    'user': os.getenv('POSTGRES_USER'),
+    'password': os.getenv('POSTGRES_PASSWORD')
+})
+
+
+@pytest.fixture(scope="session")
+def pool():
+    """Connection pool shared by every database test, also across threads"""
+    from psycopg2.pool import ThreadedConnectionPool
+
+    connection_pool = ThreadedConnectionPool(1, 8, **DB_PARAMS)
+    yield connection_pool
+    connection_pool.closeall()
+
+
+@pytest.fixture
+def conn(pool):
+    """A pooled connection; uncommitted work is rolled back afterwards"""
+    connection = pool.getconn()
+    yield connection
+    connection.rollback()
+    pool.putconn(connection)
+
+
+@pytest.fixture
+def cur(conn):
+    """A fresh cursor per test"""
+    cursor = conn.cursor()
+    yield cursor
+    cursor.close()
+
+
+@pytest.fixture(scope="session")
+def test_table(pool):
+    """Scratch table for the CRUD tests, created once per session"""
+    connection = pool.getconn()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS test_connection (
+                id SERIAL PRIMARY KEY,
+                test_data VARCHAR(255),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+    connection.commit()
+    pool.putconn(connection)
+
+    yield "test_connection"
+
+    connection = pool.getconn()
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS test_connection;")
+    connection.commit()
+    pool.putconn(connection)
+
+
+@pytest.fixture
+def bulk_insert(test_table):
+    """Insert test_data values into the scratch table in one round trip
+
+    Returns the inserted (id, test_data, created_at) rows.
+    """
+    from psycopg2.extras import execute_values
+
+    def insert(cursor, values):
+        return execute_values(
+            cursor,
+            f"INSERT INTO {test_table} (test_data) VALUES %s "
+            "RETURNING id, test_data, created_at",
+            [(value,) for value in values],
+            fetch=True)
+
+    return insert
+
+
+def _pooled_session():
+    session = requests.Session()
+    # Every test talks to the one backend host, so a single warm pool will do
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return session
+
+
+@pytest.fixture
+def sqlite_db():
+    """A throwaway in-memory SQLite session holding the backend's tables"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app import models
+
+    # StaticPool keeps the one in-memory database alive across connections
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_user(sqlite_db):
+    """A user stored in sqlite_db"""
+    from app.models import User
+
+    user = User(username="testuser")
+    sqlite_db.add(user)
+    sqlite_db.commit()
+    return user
+
+
+@pytest.fixture
+def receipts_client(sqlite_db, sqlite_user):
+    """TestClient for the receipts router, backed by sqlite_db
+
+    Requests run as sqlite_user, without a token.
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.database import get_db
+    from app.routes import receipts
+    from app.routes.auth import get_current_user
+
+    app = FastAPI()
+    app.include_router(receipts.router, prefix="/receipts")
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    app.dependency_overrides[get_current_user] = lambda: sqlite_user
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def transactions_client(sqlite_db, sqlite_user):
+    """TestClient for the transactions router, backed by sqlite_db
+
+    Requests run as sqlite_user, without a token.
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.cache import user_categories_cache, user_persons_cache
+    from app.database import get_db
+    from app.routes import transactions
+    from app.routes.auth import get_current_user
+
+    app = FastAPI()
+    app.include_router(transactions.router, prefix="/transactions")
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    app.dependency_overrides[get_current_user] = lambda: sqlite_user
+    # Every sqlite_db reuses the same user id, so drop names cached by
+    # an earlier test's database
+    user_categories_cache.pop(sqlite_user.id)
+    user_persons_cache.pop(sqlite_user.id)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def http():
+    """One pooled, unauthenticated HTTP session shared by every API test"""
+    session = _pooled_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def ensure_user(http):
+    """Register the test user once for the whole test session"""
+    http.post(REGISTER_URL, json=CREDENTIALS)
+
+
+@pytest.fixture(scope="session")
+def token(http, ensure_user):
+    """Log in once for the whole test session"""
+    response = http.post(LOGIN_URL, data=CREDENTIALS)
+    if response.status_code != 200:
+        pytest.skip(f"Login failed: {response.status_code} - {response.text}")
+    return response.json()["access_token"]
+
+
+@pytest.fixture
+def auth_headers(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def auth_http(token):
+    """A separate pooled session that sends the bearer token on every request
+
+    Kept apart from http so the token never leaks into unauthenticated tests.
+    """
+    session = _pooled_session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    yield session
+    session.close()
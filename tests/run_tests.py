@@ -4,66 +4,123 @@ GoBudget Test Runner
 Runs all tests for the GoBudget application
 """
 
+import asyncio
+import importlib.util
+import json
 import os
 import sys
 import subprocess
 import time
 from pathlib import Path
 
+from settings import BASE_URL
 
-def run_command(command, description):
-    """Run a command and return success status"""
+
+def run_command(command, description, capture=False):
+    """Run a command, streaming its output, and return success status
+
+    With capture=True the output is also collected and returned as
+    (success, output).
+    """
     print(f"\n🔍 {description}")
     print(f"Running: {command}")
 
+    lines = []
     try:
-        result = subprocess.run(
-            command, shell=True, capture_output=True, text=True, cwd=os.getcwd())
+        process = subprocess.Popen(
+            command, shell=True, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, bufsize=1, cwd=os.getcwd())
+        for line in process.stdout:
+            print(line, end="")
+            if capture:
+                lines.append(line)
+        success = process.wait() == 0
 
-        if result.returncode == 0:
+        if success:
             print(f"✅ {description} - PASSED")
-            if result.stdout:
-                print("Output:")
-                print(result.stdout)
-            return True
         else:
             print(f"❌ {description} - FAILED")
-            if result.stderr:
-                print("Error:")
-                print(result.stderr)
-            if result.stdout:
-                print("Output:")
-                print(result.stdout)
-            return False
 
     except Exception as e:
         print(f"❌ {description} - ERROR: {e}")
-        return False
+        success = False
+
+    if capture:
+        return success, "".join(lines)
+    return success
+
 
+def count_running_containers():
+    """Count the running docker compose containers"""
+    output = subprocess.run(
+        ["docker", "compose", "ps", "--format", "json"],
+        capture_output=True, text=True, check=True).stdout.strip()
+    # Older compose releases print one JSON array, newer ones a line per container
+    if output.startswith("["):
+        containers = json.loads(output)
+    else:
+        containers = [json.loads(line) for line in output.splitlines() if line]
+    return sum(1 for container in containers
+               if container.get("State") == "running")
+
+
+async def wait_for_service(client, url, service_name, max_attempts=30, timeout=60):
+    """Wait for a service to be ready, backing off between attempts
 
-def wait_for_service(url, service_name, max_attempts=30):
-    """Wait for a service to be ready"""
-    import requests
+    Gives up after max_attempts or once timeout seconds have passed in
+    total, whichever comes first.
+    """
+    import httpx
 
     print(f"⏳ Waiting for {service_name} to be ready at {url}")
 
+    deadline = time.monotonic() + timeout
     for attempt in range(max_attempts):
         try:
-            response = requests.get(url, timeout=5)
+            response = await client.get(url)
             if response.status_code < 500:  # Accept any non-server error
                 print(f"✅ {service_name} is ready!")
                 return True
-        except requests.exceptions.RequestException:
+        except httpx.HTTPError:
             pass
 
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
         print(
             f"Attempt {attempt + 1}/{max_attempts} - {service_name} not ready yet...")
-        time.sleep(2)
+        await asyncio.sleep(min(2 ** attempt, 10, remaining))
 
-    print(f"❌ {service_name} failed to start after {max_attempts} attempts")
+    print(f"❌ {service_name} failed to start after {attempt + 1} attempts")
     return False
 
 
+async def wait_for_services():
+    """Poll the backend and frontend concurrently
+
+    Returns the (name, ready) result rows and whether the backend is up.
+    """
+    import httpx
+
+    async with httpx.AsyncClient(timeout=5) as client:
+        async def backend():
+            rows = []
+            ready = await wait_for_service(
+                client, f"{BASE_URL}/health", "Backend API")
+            rows.append(("Backend Ready", ready))
+            if not ready:
+                ready = await wait_for_service(
+                    client, f"{BASE_URL}/", "Backend API (fallback)")
+                rows.append(("Backend Ready (fallback)", ready))
+            return rows, ready
+
+        (backend_rows, backend_ready), frontend_ready = await asyncio.gather(
+            backend(),
+            wait_for_service(client, "http://localhost:3001", "Frontend"))
+
+    return backend_rows + [("Frontend Ready", frontend_ready)], backend_ready
+
+
 def main():
     """Main test runner function"""
     print("🚀 Starting GoBudget Test Suite")
@@ -81,25 +138,15 @@ def main():
         "docker-compose ps", "Check Docker services status")
     results.append(("Docker Services", docker_running))
 
-    # Test 2: Wait for backend to be ready
-    backend_ready = wait_for_service(
-        "http://localhost:8001/health", "Backend API")
-    results.append(("Backend Ready", backend_ready))
-
-    if not backend_ready:
-        backend_ready = wait_for_service(
-            "http://localhost:8001/", "Backend API (fallback)")
-        results.append(("Backend Ready (fallback)", backend_ready))
-
-    # Test 3: Wait for frontend to be ready (if running)
-    frontend_ready = wait_for_service("http://localhost:3001", "Frontend")
-    results.append(("Frontend Ready", frontend_ready))
+    # Tests 2-3: Wait for backend and frontend (if running) to be ready
+    service_results, backend_ready = asyncio.run(wait_for_services())
+    results.extend(service_results)
 
     # Test 4: Database connection test
     if backend_ready:
         print("\n📋 Test 4: Database Connection")
         db_test = run_command(
-            "python tests/test_database.py", "Database connection test")
+            "python -m pytest tests/test_database.py", "Database connection test")
         results.append(("Database Connection", db_test))
     else:
         print("\n⚠️ Skipping database test - backend not ready")
@@ -109,7 +156,7 @@ def main():
     if backend_ready:
         print("\n📋 Test 5: API Endpoints")
         api_test = run_command(
-            "python tests/test_api.py", "API endpoints test")
+            "python -m pytest tests/test_api.py", "API endpoints test")
         results.append(("API Endpoints", api_test))
     else:
         print("\n⚠️ Skipping API test - backend not ready")
@@ -118,8 +165,13 @@ def main():
     # Test 6: Upload functionality test
     if backend_ready:
         print("\n📋 Test 6: Upload Functionality")
-        upload_test = run_command(
-            "python tests/test_upload.py", "Upload functionality test")
+        upload_command = "python -m pytest tests/test_upload.py -m upload"
+        # Spread the cases over workers when pytest-xdist is installed
+        if importlib.util.find_spec("xdist") is not None:
+            upload_command += " -n 3"
+        else:
+            print("⚠️ pytest-xdist not installed - running upload tests serially")
+        upload_test = run_command(upload_command, "Upload functionality test")
         results.append(("Upload Functionality", upload_test))
     else:
         print("\n⚠️ Skipping upload test - backend not ready")
@@ -127,8 +179,13 @@ def main():
 
     # Test 7: Docker containers health check
     print("\n📋 Test 7: Container Health Check")
-    health_check = run_command(
-        "docker-compose ps --filter 'status=running' | grep -c 'Up'", "Container health check")
+    try:
+        running = count_running_containers()
+        health_check = running > 0
+        print(f"{'✅' if health_check else '❌'} {running} container(s) running")
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        print(f"❌ Container health check - ERROR: {e}")
+        health_check = False
     results.append(("Container Health", health_check))
 
     # Summary
@@ -136,15 +193,12 @@ def main():
     print("📊 TEST RESULTS SUMMARY")
     print("=" * 50)
 
-    passed = 0
+    print("\n".join(
+        f"{test_name:<25} {'✅ PASSED' if success else '❌ FAILED'}"
+        for test_name, success in results))
+    passed = sum(1 for _, success in results if success)
     total = len(results)
 
-    for test_name, success in results:
-        status = "✅ PASSED" if success else "❌ FAILED"
-        print("25")
-        if success:
-            passed += 1
-
     print(f"\n🎯 Overall: {passed}/{total} tests passed")
 
     if passed == total:
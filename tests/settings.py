@@ -0,0 +1,10 @@
+"""Backend URLs and the test account shared by the API tests and run_tests.py"""
+
+# Backend under test and the account the API tests log in with
+BASE_URL = "http://localhost:8001"
+REGISTER_URL = f"{BASE_URL}/auth/register"
+LOGIN_URL = f"{BASE_URL}/auth/login"
+CREDENTIALS = {
+    "username": "testuser",
+    "password": "testpassword"
+}
@@ -0,0 +1,89 @@
+"""
+Unit tests for the in-process TTL cache.
+These tests don't require Docker services to be running.
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from app import cache as cache_module
+from app.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's monotonic clock with one the test moves by hand"""
+    now = SimpleNamespace(value=0.0)
+    monkeypatch.setattr(cache_module, "time",
+                        SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=30, maxsize=10)
+    cache.set(1, ("names",))
+
+    clock.value = 29.9
+    assert cache.get(1) == ("names",)
+    clock.value = 30
+    assert cache.get(1) is None
+
+
+def test_full_cache_evicts_expired_then_oldest(clock):
+    cache = TTLCache(ttl=30, maxsize=3)
+    cache.set(1, "a")
+    clock.value = 10
+    cache.set(2, "b")
+    cache.set(3, "c")
+
+    # Key 1 has expired, so it makes room without evicting anything live
+    clock.value = 31
+    cache.set(4, "d")
+    assert [cache.get(key) for key in (1, 2, 3, 4)] == [None, "b", "c", "d"]
+
+    # Nothing has expired now, so the oldest entry goes
+    cache.set(5, "e")
+    assert [cache.get(key) for key in (2, 3, 4, 5)] == [None, "c", "d", "e"]
+
+    # Overwriting a cached key never evicts
+    cache.set(3, "C")
+    assert [cache.get(key) for key in (3, 4, 5)] == ["C", "d", "e"]
+
+
+def test_set_after_pop_drops_stale_value():
+    cache = TTLCache(ttl=30, maxsize=10)
+    # A reader misses and starts loading the value...
+    generation = cache.generation(1)
+    # ...while a writer commits and invalidates the key
+    cache.pop(1)
+    cache.set(1, ("stale",), generation)
+
+    assert cache.get(1) is None
+
+    cache.set(1, ("fresh",), cache.generation(1))
+    assert cache.get(1) == ("fresh",)
+
+
+def test_pop_only_affects_its_own_key():
+    cache = TTLCache(ttl=30, maxsize=10)
+    generation = cache.generation(1)
+    cache.pop(2)
+    cache.set(1, ("names",), generation)
+
+    assert cache.get(1) == ("names",)
+
+
+def test_popped_keys_are_bounded_by_maxsize():
+    cache = TTLCache(ttl=30, maxsize=3)
+    generation = cache.generation(1)
+    for key in range(100):
+        cache.pop(key)
+
+    assert len(cache._popped) == 3
+    # Key 1's pop is no longer remembered, but a read that started before
+    # it is still not cached
+    cache.set(1, ("stale",), generation)
+    assert cache.get(1) is None
+
+    cache.set(1, ("fresh",), cache.generation(1))
+    assert cache.get(1) == ("fresh",)
@@ -1,56 +1,70 @@
-import sys
-import os
-
-# Add backend to path like other tests do
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+import pytest
 
 from app.routes.receipts import _normalize_totals
 
 
-def test_normalize_when_total_is_none_uses_products_sum():
-    data = {
-        "total": None,
-        "total_paid": 2.99,
-        "total_discount": None,
-        "products": [
-            {"price": 2.99, "quantity": 1}
-        ],
-    }
-    total, discount, paid = _normalize_totals(data)
-    assert total == 2.99
-    assert discount == 0.0
-    assert paid == 2.99
-
-
-essential = {
+ESSENTIAL = {
     "products": [
         {"price": 3.00, "quantity": 2},  # 6.00
     ]
 }
 
-
-def test_normalize_when_only_total_sets_paid_minus_discount():
-    data = {**essential, "total": 10.0,
-            "total_discount": 3.0, "total_paid": None}
-    total, discount, paid = _normalize_totals(data)
-    assert total == 10.0
-    assert discount == 3.0
-    assert paid == 7.0
-
-
-def test_normalize_when_only_paid_sets_total_equal_paid():
-    data = {**essential, "total": None,
-            "total_discount": None, "total_paid": 5.5}
-    total, discount, paid = _normalize_totals(data)
-    assert total == 6.0  # prefers products sum when available
-    assert discount == 0.5  # 6.0 - 5.5
-    assert paid == 5.5
+CASES = [
+    pytest.param(
+        {"total": None, "total_paid": 2.99, "total_discount": None,
+         "products": [{"price": 2.99, "quantity": 1}]},
+        (2.99, 0.0, 2.99),
+        id="total_none_uses_products_sum"),
+    pytest.param(
+        {**ESSENTIAL, "total": 10.0, "total_discount": 3.0, "total_paid": None},
+        (10.0, 3.0, 7.0),
+        id="only_total_sets_paid_minus_discount"),
+    pytest.param(
+        {**ESSENTIAL, "total": 10.0},
+        (10.0, 0.0, 10.0),
+        id="only_total_without_discount_pays_total"),
+    # Prefers the products sum when available; discount is 6.0 - 5.5
+    pytest.param(
+        {**ESSENTIAL, "total": None, "total_discount": None, "total_paid": 5.5},
+        (6.0, 0.5, 5.5),
+        id="only_paid_sets_total_from_products"),
+    # max(6.0 - 7.0, 0.0) keeps the discount from going negative
+    pytest.param(
+        {**ESSENTIAL, "total_paid": 7.0},
+        (6.0, 0.0, 7.0),
+        id="paid_above_products_sum_has_no_discount"),
+    # A known total is used as-is; the products are never summed
+    pytest.param(
+        {"total": "12.345", "total_paid": 10, "total_discount": 2.3,
+         "products": [{"price": "n/a", "quantity": 1}]},
+        (12.35, 2.3, 10.0),
+        id="all_present_skips_products"),
+    # An unreadable product discards the products sum, so paid is used
+    pytest.param(
+        {"total": None, "total_paid": 4.0,
+         "products": [{"price": 3.00, "quantity": 2}, "not a product"]},
+        (4.0, 0.0, 4.0),
+        id="non_dict_product_discards_products_sum"),
+    pytest.param(
+        {"total": None, "total_paid": 4.0,
+         "products": [{"price": 3.00, "quantity": 2},
+                      {"price": "n/a", "quantity": 1}]},
+        (4.0, 0.0, 4.0),
+        id="bad_price_discards_products_sum"),
+    pytest.param(
+        {"total": None, "total_paid": None,
+         "products": [{"price": 3.00, "quantity": "two"}]},
+        (0.0, 0.0, 0.0),
+        id="bad_quantity_without_paid_defaults_to_zero"),
+    pytest.param(
+        {"total": None, "total_paid": None, "total_discount": None,
+         "products": []},
+        (0.0, 0.0, 0.0),
+        id="all_none_defaults_to_zero"),
+    pytest.param({}, (0.0, 0.0, 0.0), id="empty_defaults_to_zero"),
+]
 
 
-def test_normalize_all_none_defaults_to_zero():
-    data = {"total": None, "total_paid": None,
-            "total_discount": None, "products": []}
-    total, discount, paid = _normalize_totals(data)
-    assert total == 0.0
-    assert discount == 0.0
-    assert paid == 0.0
+@pytest.mark.parametrize("data,expected", CASES)
+def test_normalize_totals(data, expected):
+    assert _normalize_totals(data) == expected
@@ -5,93 +5,113 @@ These tests don't require Docker services to be running.
 
 import pytest
 from datetime import date
-from pydantic import ValidationError
-
-# Import the models and schemas
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from types import MappingProxyType
+from pydantic import TypeAdapter, ValidationError
 
 from app.schemas import ReceiptBase, ReceiptCreate, Receipt, ReceiptProduct
 from app.models import Receipt as ReceiptModel, ReceiptProduct as ReceiptProductModel
 
+# Built once so every test reuses the same compiled validators
+_RECEIPT_BASE_ADAPTER = TypeAdapter(ReceiptBase)
+_RECEIPT_CREATE_ADAPTER = TypeAdapter(ReceiptCreate)
+
+# Keys every extracted receipt must carry
+_REQUIRED_KEYS = frozenset({"market", "branch", "total", "total_discount", "total_paid", "date", "products"})
+
+# The tests only need some valid date, so read the clock once
+_TODAY = date.today()
+
+# Receipts whose total - total_discount == total_paid, one per scenario;
+# read-only so the cases are shared without defensive copies
+_BALANCED_RECEIPTS = [
+    pytest.param(MappingProxyType({
+        "market": "Supermarket ABC",
+        "branch": "Downtown Branch",
+        "invoice": "INV-123",
+        "date": _TODAY,
+        "total": 150.00,  # Total before discounts
+        "total_discount": 25.00,  # Discount amount
+        "total_paid": 125.00  # Amount actually paid
+    }), id="new_fields"),
+    pytest.param(MappingProxyType({
+        "market": "Supermarket XYZ",
+        "branch": "Mall Branch",
+        "date": _TODAY,
+        "total": 100.00,
+        "total_discount": 0.00,
+        "total_paid": 100.00
+    }), id="zero_discount"),
+    pytest.param(MappingProxyType({
+        "market": "Supermarket DEF",
+        "branch": "Suburb Branch",
+        "date": _TODAY,
+        "total": 75.50,
+        "total_paid": 75.50
+    }), id="default_discount"),
+    pytest.param(MappingProxyType({
+        "market": "MathMart",
+        "branch": "Calculator Branch",
+        "date": _TODAY,
+        "total": 100.00,
+        "total_discount": 15.00,
+        "total_paid": 85.00
+    }), id="total_calculations"),
+    pytest.param(MappingProxyType({
+        "market": "NoDiscountMart",
+        "branch": "Full Price Branch",
+        "date": _TODAY,
+        "total": 50.00,
+        "total_discount": 0.00,
+        "total_paid": 50.00
+    }), id="no_discount"),
+    # Old receipts migrate with total == total_paid and no discount info
+    pytest.param(MappingProxyType({
+        "market": "OldMart",
+        "branch": "Legacy Branch",
+        "date": _TODAY,
+        "total": 75.00,
+        "total_discount": 0.00,
+        "total_paid": 75.00
+    }), id="backward_compatibility"),
+]
+
 
 class TestReceiptSchemas:
     """Test receipt Pydantic schemas with new fields"""
 
-    def test_receipt_base_with_new_fields(self):
-        """Test ReceiptBase schema includes new fields"""
-        receipt_data = {
-            "market": "Supermarket ABC",
-            "branch": "Downtown Branch",
-            "invoice": "INV-123",
-            "date": date.today(),
-            "total": 150.00,  # Total before discounts
-            "total_discount": 25.00,  # Discount amount
-            "total_paid": 125.00  # Amount actually paid
-        }
-        
-        receipt = ReceiptBase(**receipt_data)
-        
-        assert receipt.market == "Supermarket ABC"
-        assert receipt.branch == "Downtown Branch"
-        assert receipt.invoice == "INV-123"
-        assert receipt.total == 150.00
-        assert receipt.total_discount == 25.00
-        assert receipt.total_paid == 125.00
-
-    def test_receipt_base_with_zero_discount(self):
-        """Test receipt with no discount"""
-        receipt_data = {
-            "market": "Supermarket XYZ",
-            "branch": "Mall Branch",
-            "date": date.today(),
-            "total": 100.00,
-            "total_discount": 0.00,
-            "total_paid": 100.00
-        }
-        
-        receipt = ReceiptBase(**receipt_data)
-        
-        assert receipt.total == receipt.total_paid
-        assert receipt.total_discount == 0.00
+    @pytest.mark.parametrize("receipt_data", _BALANCED_RECEIPTS)
+    def test_receipt_base_totals(self, receipt_data):
+        """Test ReceiptBase keeps the new fields and total - discount == paid"""
+        receipt = _RECEIPT_BASE_ADAPTER.validate_python(receipt_data)
 
-    def test_receipt_base_default_discount(self):
-        """Test that total_discount defaults to 0 when not provided"""
-        receipt_data = {
-            "market": "Supermarket DEF",
-            "branch": "Suburb Branch",
-            "date": date.today(),
-            "total": 75.50,
-            "total_paid": 75.50
-        }
-        
-        receipt = ReceiptBase(**receipt_data)
-        
-        assert receipt.total_discount == 0
+        for key, value in receipt_data.items():
+            assert getattr(receipt, key) == value
+        # total_discount defaults to 0 when not provided
+        assert receipt.total_discount == receipt_data.get("total_discount", 0)
+        assert receipt.total - receipt.total_discount == receipt.total_paid
 
     def test_receipt_base_missing_required_fields(self):
         """Test validation fails when required fields are missing"""
         
         # Missing total_paid
         with pytest.raises(ValidationError):
-            ReceiptBase(
-                market="Test Market",
-                branch="Test Branch",
-                date=date.today(),
-                total=100.00
+            _RECEIPT_BASE_ADAPTER.validate_python({
+                "market": "Test Market",
+                "branch": "Test Branch",
+                "date": _TODAY,
+                "total": 100.00
                 # total_paid is missing
-            )
+            })
 
         # Missing total
         with pytest.raises(ValidationError):
-            ReceiptBase(
-                market="Test Market",
-                branch="Test Branch",
-                date=date.today(),
-                total_paid=100.00
+            _RECEIPT_BASE_ADAPTER.validate_python({
+                "market": "Test Market",
+                "branch": "Test Branch",
+                "date": _TODAY,
+                "total_paid": 100.00
                 # total is missing
-            )
+            })
 
     def test_receipt_create_with_products(self):
         """Test ReceiptCreate with products"""
@@ -107,14 +127,14 @@ class TestReceiptSchemas:
         receipt_data = {
             "market": "Local Store",
             "branch": "Main Street",
-            "date": date.today(),
+            "date": _TODAY,
             "total": 14.00,
             "total_discount": 1.00,
             "total_paid": 13.00,
             "products": [product_data]
         }
         
-        receipt = ReceiptCreate(**receipt_data)
+        receipt = _RECEIPT_CREATE_ADAPTER.validate_python(receipt_data)
         
         assert len(receipt.products) == 1
         assert receipt.products[0].product == "Bread"
@@ -191,8 +211,7 @@ class TestReceiptAPIResponseStructure:
             "products": []
         }
         
-        required_keys = ["market", "branch", "total", "total_discount", "total_paid", "date", "products"]
-        missing_keys = [key for key in required_keys if key not in complete_data]
+        missing_keys = _REQUIRED_KEYS.difference(complete_data)
         
         assert len(missing_keys) == 0, f"Missing required keys: {missing_keys}"
         
@@ -206,79 +225,12 @@ class TestReceiptAPIResponseStructure:
             "products": []
         }
         
-        missing_keys = [key for key in required_keys if key not in incomplete_data]
+        missing_keys = _REQUIRED_KEYS.difference(incomplete_data)
         assert len(missing_keys) > 0, "Should detect missing keys"
         assert "total_discount" in missing_keys
         assert "total_paid" in missing_keys
 
 
-class TestReceiptCalculations:
-    """Test receipt calculation logic"""
-
-    def test_total_calculations(self):
-        """Test that total, discount, and paid amounts are consistent"""
-        
-        # Test case where total - total_discount = total_paid
-        total_before = 100.00
-        discount = 15.00
-        total_paid = 85.00
-        
-        assert total_before - discount == total_paid
-        
-        # Test receipt with this data
-        receipt_data = {
-            "market": "MathMart",
-            "branch": "Calculator Branch",
-            "date": date.today(),
-            "total": total_before,
-            "total_discount": discount,
-            "total_paid": total_paid
-        }
-        
-        receipt = ReceiptBase(**receipt_data)
-        
-        # Verify the math works out
-        assert receipt.total - receipt.total_discount == receipt.total_paid
-
-    def test_no_discount_scenario(self):
-        """Test receipt where no discount was applied"""
-        
-        receipt_data = {
-            "market": "NoDiscountMart",
-            "branch": "Full Price Branch",
-            "date": date.today(),
-            "total": 50.00,
-            "total_discount": 0.00,
-            "total_paid": 50.00
-        }
-        
-        receipt = ReceiptBase(**receipt_data)
-        
-        assert receipt.total == receipt.total_paid
-        assert receipt.total_discount == 0.00
-
-    def test_backward_compatibility_logic(self):
-        """Test logic for handling old receipts during migration"""
-        
-        # Simulate old receipt where total was the amount paid
-        old_total_value = 75.00  # This was the amount actually paid
-        
-        # In migration, this should become:
-        migrated_data = {
-            "market": "OldMart",
-            "branch": "Legacy Branch", 
-            "date": date.today(),
-            "total": old_total_value,  # Assume no discount for old receipts
-            "total_discount": 0.00,    # No discount info available
-            "total_paid": old_total_value  # What was actually paid
-        }
-        
-        receipt = ReceiptBase(**migrated_data)
-        
-        assert receipt.total == receipt.total_paid  # No discount applied
-        assert receipt.total_discount == 0.00
-
-
 if __name__ == "__main__":
     # Run the tests
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -3,125 +3,124 @@ Integration tests for receipt processing with mocked database operations.
 Tests the complete flow without requiring actual database connections.
 """
 
+import math
+import orjson
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from datetime import date, datetime
-import json
+from dataclasses import dataclass
+from operator import itemgetter
+from types import MappingProxyType, SimpleNamespace
+from datetime import date
+from typing import List
+from pydantic import TypeAdapter
 
-# Import required modules
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from app.schemas import ReceiptProductCreate, ReceiptUploadResponse
 
-from app.schemas import ReceiptUploadResponse
+
+def _freeze(value):
+    """Read-only view of parsed JSON: dicts become mappingproxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Keys every extracted receipt must carry
+_REQUIRED_KEYS = frozenset({"market", "branch", "total", "total_discount", "total_paid", "date", "products"})
+
+# Receipt columns copied from the extracted data, and the defaults for the
+# optional ones
+_RECEIPT_FIELDS = ("market", "branch", "invoice", "total", "total_discount", "total_paid")
+_RECEIPT_DEFAULTS = MappingProxyType({"invoice": None, "total_discount": 0})
+_PRODUCT_LIST_ADAPTER = TypeAdapter(List[ReceiptProductCreate])
+
+# Mock of the new extraction API response, parsed once at import. total is
+# before discount, total_discount the discount applied and total_paid the
+# amount actually paid. Frozen so the tests can share it without copying
+_NEW_API_RESPONSE = _freeze(orjson.loads(b"""{
+    "results": [
+        {
+            "success": true,
+            "receipt": {
+                "market": "SuperMart Plus",
+                "branch": "Downtown Plaza",
+                "invoice": "SM-2024-0917-001",
+                "total": 145.75,
+                "total_discount": 22.85,
+                "total_paid": 122.90,
+                "date": "17/09/2024",
+                "products": [
+                    {
+                        "product_type": "Groceries",
+                        "product": "Organic Bananas",
+                        "price": 4.50,
+                        "quantity": 2,
+                        "discount": 0.45,
+                        "discount2": 0.00
+                    },
+                    {
+                        "product_type": "Household",
+                        "product": "Dish Soap",
+                        "price": 8.99,
+                        "quantity": 1,
+                        "discount": 1.50,
+                        "discount2": 0.50
+                    }
+                ]
+            },
+            "error_message": null
+        }
+    ],
+    "total_files": 1,
+    "successful_extractions": 1,
+    "failed_extractions": 0
+}"""))
+
+
+def _parse_ddmmyyyy(s: str) -> date:
+    """Parse the extractor's fixed DD/MM/YYYY dates without strptime"""
+    return date(int(s[6:10]), int(s[3:5]), int(s[0:2]))
+
+
+@dataclass(slots=True, frozen=True)
+class MigratedReceipt:
+    """A receipt after the total/total_discount/total_paid migration"""
+    id: int
+    market: str
+    date: str
+    total: float
+    total_discount: float
+    total_paid: float
 
 
 class TestReceiptIntegration:
     """Integration tests for receipt processing flow"""
 
-    @patch('app.routes.receipts.httpx.AsyncClient')
-    @patch('app.routes.receipts.get_db')
-    @patch('app.routes.receipts.get_current_user')
-    def test_complete_receipt_upload_flow_new_api(self, mock_user, mock_db, mock_client):
+    def test_complete_receipt_upload_flow_new_api(self):
         """Test complete receipt upload flow with new API response structure"""
         
-        # Mock user
-        mock_current_user = Mock()
-        mock_current_user.id = 1
-        mock_user.return_value = mock_current_user
-        
-        # Mock database session
-        mock_session = Mock()
-        mock_db.return_value = mock_session
-        
-        # Mock the new API response
-        new_api_response = {
-            "results": [
-                {
-                    "success": True,
-                    "receipt": {
-                        "market": "SuperMart Plus",
-                        "branch": "Downtown Plaza",
-                        "invoice": "SM-2024-0917-001",
-                        "total": 145.75,      # Total before discount
-                        "total_discount": 22.85,  # Total discount applied
-                        "total_paid": 122.90,     # Amount actually paid
-                        "date": "17/09/2024",
-                        "products": [
-                            {
-                                "product_type": "Groceries",
-                                "product": "Organic Bananas",
-                                "price": 4.50,
-                                "quantity": 2,
-                                "discount": 0.45,
-                                "discount2": 0.00
-                            },
-                            {
-                                "product_type": "Household",
-                                "product": "Dish Soap",
-                                "price": 8.99,
-                                "quantity": 1,
-                                "discount": 1.50,
-                                "discount2": 0.50
-                            }
-                        ]
-                    },
-                    "error_message": None
-                }
-            ],
-            "total_files": 1,
-            "successful_extractions": 1,
-            "failed_extractions": 0
-        }
-        
-        # Mock HTTP client response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = new_api_response
-        
-        mock_client_instance = Mock()
-        mock_client_instance.post.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
-        
-        # Mock database operations
-        mock_receipt = Mock()
-        mock_receipt.id = 123
-        mock_session.add.return_value = None
-        mock_session.flush.return_value = None
-        mock_session.commit.return_value = None
-        mock_session.refresh.return_value = None
-        
-        # Create mock file upload
-        mock_file = Mock()
-        mock_file.filename = "test_receipt.pdf"
-        mock_file.read.return_value = b"fake pdf content"
+        mock_current_user = SimpleNamespace(id=1)
         
         # Test the validation logic that would happen in the actual route
-        result = new_api_response["results"][0]
+        result = _NEW_API_RESPONSE["results"][0]
         receipt_data = result["receipt"]
         
         # Validate new required fields are present
-        required_keys = ["market", "branch", "total", "total_discount", "total_paid", "date", "products"]
-        missing_keys = [key for key in required_keys if key not in receipt_data]
+        missing_keys = _REQUIRED_KEYS.difference(receipt_data)
         
         assert len(missing_keys) == 0, f"Missing required keys: {missing_keys}"
         
         # Test date parsing
         date_str = receipt_data["date"]
-        parsed_date = datetime.strptime(date_str, "%d/%m/%Y").date()
+        parsed_date = _parse_ddmmyyyy(date_str)
         assert parsed_date == date(2024, 9, 17)
         
         # Test receipt creation with new fields
-        receipt_creation_data = {
-            "market": receipt_data["market"],
-            "branch": receipt_data["branch"],
-            "invoice": receipt_data.get("invoice"),
-            "total": receipt_data["total"],
-            "total_discount": receipt_data.get("total_discount", 0),
-            "total_paid": receipt_data["total_paid"],
-            "date": parsed_date,
-            "user_id": mock_current_user.id
-        }
+        receipt_creation_data = (
+            _RECEIPT_DEFAULTS
+            | {key: receipt_data[key] for key in _RECEIPT_FIELDS if key in receipt_data}
+            | {"date": parsed_date, "user_id": mock_current_user.id}
+        )
         
         # Verify all required data is present and correct
         assert receipt_creation_data["market"] == "SuperMart Plus"
@@ -134,19 +133,9 @@ class TestReceiptIntegration:
         products_data = receipt_data["products"]
         assert len(products_data) == 2
         
-        for product_data in products_data:
-            product_creation_data = {
-                "product_type": product_data["product_type"],
-                "product": product_data["product"],
-                "quantity": product_data["quantity"],
-                "price": product_data["price"],
-                "discount": product_data.get("discount", 0),
-                "discount2": product_data.get("discount2", 0),
-                "receipt_id": 123  # Mock receipt ID
-            }
-            
-            # Verify product data is correctly structured
-            assert all(key in product_creation_data for key in ["product_type", "product", "quantity", "price"])
+        # Validate every product against the create schema in one pass
+        validated_products = _PRODUCT_LIST_ADAPTER.validate_python(products_data)
+        assert all(p.product_type and p.product for p in validated_products)
 
     def test_migration_scenario_simulation(self):
         """Test migration scenario for existing receipts"""
@@ -158,25 +147,19 @@ class TestReceiptIntegration:
             {"id": 3, "total": 45.00, "market": "VintageShop", "date": "2024-09-10"}
         ]
         
-        # Simulate migration process
-        migrated_receipts = []
-        for receipt in existing_receipts:
-            migrated_receipt = {
-                "id": receipt["id"],
-                "market": receipt["market"],
-                "date": receipt["date"],
-                "total": receipt["total"],         # Keep same value (assume no discount)
-                "total_discount": 0.0,            # No discount info available
-                "total_paid": receipt["total"]    # Old total was amount paid
-            }
-            migrated_receipts.append(migrated_receipt)
+        # Simulate migration process: the old total was the amount paid and
+        # there is no discount info, so assume no discount
+        migrated_receipts = [
+            MigratedReceipt(r["id"], r["market"], r["date"], r["total"], 0.0, r["total"])
+            for r in existing_receipts
+        ]
         
         # Verify migration logic
         for original, migrated in zip(existing_receipts, migrated_receipts):
-            assert migrated["total"] == original["total"]
-            assert migrated["total_paid"] == original["total"]
-            assert migrated["total_discount"] == 0.0
-            assert migrated["total"] - migrated["total_discount"] == migrated["total_paid"]
+            assert migrated.total == original["total"]
+            assert migrated.total_paid == original["total"]
+            assert migrated.total_discount == 0.0
+            assert migrated.total - migrated.total_discount == migrated.total_paid
 
     def test_spending_summary_with_new_fields(self):
         """Test spending summary calculation uses correct fields"""
@@ -206,19 +189,24 @@ class TestReceiptIntegration:
             }
         ]
         
-        # Calculate spending summary using total_paid (what users actually spent)
-        total_spent = sum(receipt["total_paid"] for receipt in mock_receipts)
+        # Pull the three fields in one pass, then sum each column
         receipt_count = len(mock_receipts)
+        getter = itemgetter("total", "total_discount", "total_paid")
+        triples = [getter(receipt) for receipt in mock_receipts]
+        totals, discounts, paid = zip(*triples)
+
+        # Calculate spending summary using total_paid (what users actually spent)
+        total_spent = math.fsum(paid)
         average_per_receipt = total_spent / receipt_count
-        total_savings = sum(receipt["total_discount"] for receipt in mock_receipts)
+        total_savings = math.fsum(discounts)
         
         assert total_spent == 201.50  # 85.00 + 50.00 + 66.50
         assert receipt_count == 3
-        assert round(average_per_receipt, 2) == 67.17  # Properly rounded to 2 decimal places
+        assert math.isclose(average_per_receipt, 67.17, abs_tol=0.005)  # 67.17 to 2 decimal places
         assert total_savings == 23.75  # 15.00 + 0.00 + 8.75
         
         # Verify we're using total_paid instead of total
-        total_before_discounts = sum(receipt["total"] for receipt in mock_receipts)
+        total_before_discounts = math.fsum(totals)
         assert total_before_discounts == 225.25  # 100.00 + 50.00 + 75.25
         assert total_spent < total_before_discounts  # Should be less due to discounts
 
@@ -244,16 +232,16 @@ class TestReceiptIntegration:
         }
         
         receipt_data = incomplete_api_response["results"][0]["receipt"]
-        required_keys = ["market", "branch", "total", "total_discount", "total_paid", "date", "products"]
-        missing_keys = [key for key in required_keys if key not in receipt_data]
+        missing_keys = _REQUIRED_KEYS.difference(receipt_data)
         
         # Should detect missing fields
         assert len(missing_keys) == 2
         assert "total_discount" in missing_keys
         assert "total_paid" in missing_keys
         
-        # Simulate error response creation
-        error_response = ReceiptUploadResponse(
+        # Simulate error response creation; every field is built right here,
+        # so skip validation (test_receipt_processing covers the schema)
+        error_response = ReceiptUploadResponse.model_construct(
             success=False,
             message=f"Incomplete receipt data. Missing: {missing_keys}",
             extracted_data=receipt_data
@@ -277,8 +265,7 @@ class TestReceiptIntegration:
             "products": []
         }
         
-        required_keys = ["market", "branch", "total", "total_discount", "total_paid", "date", "products"]
-        missing_keys = [key for key in required_keys if key not in zero_discount_data]
+        missing_keys = _REQUIRED_KEYS.difference(zero_discount_data)
         
         assert len(missing_keys) == 0
         assert zero_discount_data["total"] == zero_discount_data["total_paid"]
@@ -295,7 +282,7 @@ class TestReceiptIntegration:
             "products": []
         }
         
-        missing_keys = [key for key in required_keys if key not in high_discount_data]
+        missing_keys = _REQUIRED_KEYS.difference(high_discount_data)
         
         assert len(missing_keys) == 0
         assert high_discount_data["total"] - high_discount_data["total_discount"] == high_discount_data["total_paid"]
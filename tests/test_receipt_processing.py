@@ -3,84 +3,146 @@ Unit tests for receipt API processing logic with new fields.
 Tests the actual processing functions without requiring running services.
 """
 
-import pytest
-from datetime import datetime, date
-from unittest.mock import Mock, patch
 import json
+import pytest
+from datetime import date, datetime
+from types import MappingProxyType, SimpleNamespace
 
-# Import the processing logic
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
-
+from app.routes.receipts import (
+    _parse_iso_date, get_monthly_summary, get_spending_summary, parse_receipt_json)
+from app.models import Receipt, User
 from app.schemas import ReceiptUploadResponse
 
 
+def _compile_parser(fmt: str):
+    """Build a parser for a zero-padded format made of %d, %m, %Y and literals
+
+    Field offsets are worked out once here, so parsing a date is just
+    slicing instead of strptime re-reading the format string.
+    """
+    fields, literals, width = {}, [], 0
+    chars = iter(fmt)
+    for char in chars:
+        if char == "%":
+            directive = next(chars)
+            size = 4 if directive == "Y" else 2
+            fields[directive] = slice(width, width + size)
+            width += size
+        else:
+            literals.append((width, char))
+            width += 1
+    year, month, day = fields["Y"], fields["m"], fields["d"]
+
+    def parse(value: str) -> date:
+        if len(value) != width or any(value[i] != c for i, c in literals):
+            raise ValueError(f"'{value}' does not match format '{fmt}'")
+        return date(int(value[year]), int(value[month]), int(value[day]))
+
+    return parse
+
+
+# Keys every extracted receipt must carry
+_REQUIRED_KEYS = frozenset({"market", "branch", "total", "total_discount", "total_paid", "date", "products"})
+
+# The same day, 17 September 2024, written in every format we accept
+TEST_DATES = [
+    ("17/09/2024", "%d/%m/%Y"),
+    ("17-09-2024", "%d-%m-%Y"),
+    ("2024-09-17", "%Y-%m-%d"),
+    ("09/17/2024", "%m/%d/%Y"),
+    ("09-17-2024", "%m-%d-%Y"),
+]
+
+
+@pytest.fixture(scope="module")
+def complete_receipt_data():
+    """Receipt from the new API with every required field"""
+    return MappingProxyType({
+        "market": "TestMart",
+        "branch": "Main Branch",
+        "total": 89.99,
+        "total_discount": 10.00,
+        "total_paid": 79.99,
+        "date": "17/09/2024",
+        "products": [
+            {
+                "product_type": "Food",
+                "product": "Apple",
+                "price": 1.50,
+                "quantity": 2,
+                "discount": 0.20,
+                "discount2": 0.00
+            }
+        ]
+    })
+
+
+@pytest.fixture(scope="module")
+def incomplete_receipt_data():
+    """Receipt missing the new fields (only the old total)"""
+    return MappingProxyType({
+        "market": "TestMart",
+        "branch": "Main Branch", 
+        "total": 89.99,  # Only old total field
+        "date": "17/09/2024",
+        "products": []
+    })
+
+
+@pytest.fixture(scope="module")
+def old_receipt_data():
+    """Receipt from the old API format (before the update)"""
+    return MappingProxyType({
+        "market": "OldFormatMarket",
+        "branch": "Legacy Branch",
+        "total": 45.00,  # This was the amount paid in old format
+        "date": "15/09/2024",
+        "products": []
+    })
+
+
 class TestReceiptProcessingLogic:
     """Test receipt processing logic with new API structure"""
 
-    def test_validate_new_api_response_fields(self):
+    _PARSERS = {fmt: _compile_parser(fmt) for _, fmt in TEST_DATES}
+
+    def test_validate_new_api_response_fields(self, complete_receipt_data,
+                                              incomplete_receipt_data):
         """Test validation logic for new API response structure"""
         
         # Test complete data
-        complete_receipt_data = {
-            "market": "TestMart",
-            "branch": "Main Branch",
-            "total": 89.99,
-            "total_discount": 10.00,
-            "total_paid": 79.99,
-            "date": "17/09/2024",
-            "products": [
-                {
-                    "product_type": "Food",
-                    "product": "Apple",
-                    "price": 1.50,
-                    "quantity": 2,
-                    "discount": 0.20,
-                    "discount2": 0.00
-                }
-            ]
-        }
-        
-        required_keys = ["market", "branch", "total", "total_discount", "total_paid", "date", "products"]
-        missing_keys = [key for key in required_keys if key not in complete_receipt_data]
+        missing_keys = _REQUIRED_KEYS.difference(complete_receipt_data)
         
         assert len(missing_keys) == 0, f"Complete data should have all required keys"
         
         # Test incomplete data (missing new fields)
-        incomplete_receipt_data = {
-            "market": "TestMart",
-            "branch": "Main Branch", 
-            "total": 89.99,  # Only old total field
-            "date": "17/09/2024",
-            "products": []
-        }
-        
-        missing_keys = [key for key in required_keys if key not in incomplete_receipt_data]
+        missing_keys = _REQUIRED_KEYS.difference(incomplete_receipt_data)
         
         assert "total_discount" in missing_keys
         assert "total_paid" in missing_keys
         assert len(missing_keys) == 2
 
-    def test_date_parsing_formats(self):
+    @pytest.mark.parametrize("date_str,expected_format", TEST_DATES, ids=lambda p: p)
+    def test_date_parsing_formats(self, date_str, expected_format):
         """Test various date formats are handled correctly"""
         
-        test_dates = [
-            ("17/09/2024", "%d/%m/%Y"),
-            ("17-09-2024", "%d-%m-%Y"),
-            ("2024-09-17", "%Y-%m-%d"),
-            ("09/17/2024", "%m/%d/%Y"),
-            ("09-17-2024", "%m-%d-%Y")
-        ]
-        
-        for date_str, expected_format in test_dates:
-            # Test that the date can be parsed
-            try:
-                parsed_date = datetime.strptime(date_str, expected_format).date()
-                assert isinstance(parsed_date, date)
-                print(f"✅ Successfully parsed '{date_str}' with format '{expected_format}'")
-            except ValueError as e:
-                pytest.fail(f"Failed to parse date '{date_str}' with format '{expected_format}': {e}")
+        try:
+            parsed_date = self._PARSERS[expected_format](date_str)
+            # The receipts routes fall back to strptime with these formats
+            stdlib_date = datetime.strptime(date_str, expected_format).date()
+        except ValueError as e:
+            pytest.fail(f"Failed to parse date '{date_str}' with format '{expected_format}': {e}")
+        assert parsed_date == stdlib_date == date(2024, 9, 17)
+
+    @pytest.mark.parametrize("date_str,expected", [
+        ("2024-09-17", date(2024, 9, 17)),
+        ("17/09/2024", None),   # Left to the strptime fallbacks
+        ("2024-9-17", None),    # Not zero-padded
+        ("2024-02-30", None),   # Invalid day
+    ])
+    def test_iso_date_parsing(self, date_str, expected):
+        """Test the ISO fast path taken before the strptime formats"""
+        assert _parse_iso_date(date_str) == expected
 
     def test_receipt_creation_with_new_fields(self):
         """Test creating receipt object with new field structure"""
@@ -95,13 +157,14 @@ class TestReceiptProcessingLogic:
         }
         
         # Simulate creating a receipt object (without database)
-        mock_receipt = Mock()
-        mock_receipt.market = receipt_data["market"]
-        mock_receipt.branch = receipt_data["branch"]
-        mock_receipt.invoice = receipt_data.get("invoice")
-        mock_receipt.total = receipt_data["total"]
-        mock_receipt.total_discount = receipt_data.get("total_discount", 0)
-        mock_receipt.total_paid = receipt_data["total_paid"]
+        mock_receipt = SimpleNamespace(
+            market=receipt_data["market"],
+            branch=receipt_data["branch"],
+            invoice=receipt_data.get("invoice"),
+            total=receipt_data["total"],
+            total_discount=receipt_data.get("total_discount", 0),
+            total_paid=receipt_data["total_paid"],
+        )
         
         # Verify all fields are set correctly
         assert mock_receipt.market == "NewAPIMarket"
@@ -117,7 +180,7 @@ class TestReceiptProcessingLogic:
     def test_batch_api_response_parsing(self):
         """Test parsing the new batch API response structure"""
         
-        sample_api_response = {
+        sample_payload = {
             "results": [
                 {
                     "success": True,
@@ -153,6 +216,11 @@ class TestReceiptProcessingLogic:
             "failed_extractions": 1
         }
         
+        # Parse the body the extractor sends the way the upload routes do
+        sample_api_response = parse_receipt_json(
+            json.dumps(sample_payload).encode())
+        assert sample_api_response == sample_payload
+        
         # Test parsing
         assert "results" in sample_api_response
         assert len(sample_api_response["results"]) == 2
@@ -176,18 +244,23 @@ class TestReceiptProcessingLogic:
         assert failed_result["receipt"] is None
         assert failed_result["error_message"] is not None
 
-    def test_backward_compatibility_handling(self):
+    @pytest.mark.parametrize("body", [
+        b'{"total_files": 1, "results": []}',
+        '{"total_files": 1, "results": []}',
+    ], ids=["bytes", "str"])
+    def test_parse_receipt_json(self, body):
+        """Test the extractor body parser accepts bytes and text"""
+        assert parse_receipt_json(body) == {"total_files": 1, "results": []}
+
+    @pytest.mark.parametrize("body", [b"", b"not json", b'{"total_files": 1'])
+    def test_parse_receipt_json_rejects_invalid_body(self, body):
+        """Test invalid bodies raise ValueError, which the routes handle"""
+        with pytest.raises(ValueError):
+            parse_receipt_json(body)
+
+    def test_backward_compatibility_handling(self, old_receipt_data):
         """Test handling of receipts from old API format"""
         
-        # Simulate old API response (before the update)
-        old_receipt_data = {
-            "market": "OldFormatMarket",
-            "branch": "Legacy Branch",
-            "total": 45.00,  # This was the amount paid in old format
-            "date": "15/09/2024",
-            "products": []
-        }
-        
         # Test migration logic: old 'total' becomes 'total_paid'
         migrated_data = {
             "market": old_receipt_data["market"],
@@ -210,9 +283,9 @@ class TestReceiptProcessingLogic:
         
         # Mock receipts with new field structure
         mock_receipts = [
-            Mock(total=100.00, total_discount=10.00, total_paid=90.00),
-            Mock(total=75.50, total_discount=5.50, total_paid=70.00),
-            Mock(total=50.00, total_discount=0.00, total_paid=50.00),
+            SimpleNamespace(total=100.00, total_discount=10.00, total_paid=90.00),
+            SimpleNamespace(total=75.50, total_discount=5.50, total_paid=70.00),
+            SimpleNamespace(total=50.00, total_discount=0.00, total_paid=50.00),
         ]
         
         # Calculate total spent using total_paid (what was actually paid)
@@ -255,6 +328,13 @@ class TestReceiptProcessingLogic:
         assert success_response.receipt_id == 123
         assert success_response.extracted_data["total_paid"] == 30.00
         assert success_response.extracted_data["total_discount"] == 3.75
+        # Serializes to the same JSON shape the upload routes return
+        assert success_response.model_dump() == {
+            "success": True,
+            "receipt_id": 123,
+            "message": "Receipt processed successfully",
+            "extracted_data": extracted_data
+        }
         
         # Test failure response
         failure_response = ReceiptUploadResponse(
@@ -267,6 +347,87 @@ class TestReceiptProcessingLogic:
         assert failure_response.receipt_id is None
         assert "total_discount" in failure_response.message
         assert "total_paid" in failure_response.message
+        assert failure_response.model_dump() == {
+            "success": False,
+            "receipt_id": None,
+            "message": "Missing required fields: total_discount, total_paid",
+            "extracted_data": None
+        }
+
+
+def _receipt(user, receipt_date, total, total_discount, total_paid):
+    return Receipt(market="M", branch="B", date=receipt_date, total=total,
+                   total_discount=total_discount, total_paid=total_paid,
+                   user_id=user.id)
+
+
+def test_monthly_summary_aggregates_total_paid(sqlite_db, sqlite_user):
+    """Test the SQL aggregate sums total_paid for the user's month only"""
+    other_user = User(username="otheruser")
+    sqlite_db.add(other_user)
+    sqlite_db.flush()
+    sqlite_db.add_all([
+        _receipt(sqlite_user, date(2024, 9, 1), 100.0, 10.0, 90.0),
+        _receipt(sqlite_user, date(2024, 9, 30), 75.5, 5.5, 70.0),
+        _receipt(sqlite_user, date(2024, 8, 31), 50.0, 0.0, 50.0),
+        _receipt(other_user, date(2024, 9, 15), 40.0, 0.0, 40.0),
+    ])
+    sqlite_db.commit()
+
+    summary = get_monthly_summary(
+        year=2024, month=9, db=sqlite_db, current_user=sqlite_user)
+
+    assert summary.total_spent == 160.0  # 90 + 70, not 100 + 75.5
+    assert summary.receipt_count == 2
+    assert summary.average_per_receipt == 80.0
+
+
+@pytest.mark.parametrize("period", ["week", "month"])
+def test_spending_summary_empty_period_is_zero(sqlite_db, sqlite_user, period):
+    """Test COALESCE turns the NULL sum of an empty period into 0"""
+    summary = get_spending_summary(
+        period=period, db=sqlite_db, current_user=sqlite_user)
+
+    assert summary.total_spent == 0.0
+    assert summary.receipt_count == 0
+    assert summary.average_per_receipt == 0
+
+
+def test_monthly_summary_empty_month_is_zero(sqlite_db, sqlite_user):
+    """Test a month without receipts, here a leap-year February"""
+    summary = get_monthly_summary(
+        year=2024, month=2, db=sqlite_db, current_user=sqlite_user)
+
+    assert summary.start_date == date(2024, 2, 1)
+    assert summary.end_date == date(2024, 2, 29)
+    assert (summary.total_spent, summary.receipt_count,
+            summary.average_per_receipt) == (0.0, 0, 0)
+
+
+def test_monthly_summary_route(receipts_client, sqlite_db, sqlite_user):
+    """Test the summary endpoint end to end, rendered by the router's ORJSONResponse"""
+    sqlite_db.add_all([
+        _receipt(sqlite_user, date(2024, 9, 3), 100.0, 10.0, 90.0),
+        _receipt(sqlite_user, date(2024, 9, 28), 75.5, 5.5, 70.0),
+        # Outside the requested month
+        _receipt(sqlite_user, date(2024, 10, 1), 50.0, 0.0, 50.0),
+    ])
+    sqlite_db.commit()
+
+    response = receipts_client.get(
+        "/receipts/summary", params={"year": 2024, "month": 9})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "period": "month",
+        "start_date": "2024-09-01",
+        "end_date": "2024-09-30",
+        "total_spent": 160.0,
+        "receipt_count": 2,
+        "average_per_receipt": 80.0,
+        "top_categories": [],
+    }
 
 
 if __name__ == "__main__":
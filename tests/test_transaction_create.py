@@ -0,0 +1,28 @@
+"""
+Tests for creating transactions through POST /transactions/.
+They run against an in-memory SQLite database, without Docker services.
+"""
+
+from datetime import date
+
+from app.models import Transaction
+
+
+def test_create_transaction_returns_stored_row(transactions_client, sqlite_db, sqlite_user):
+    response = transactions_client.post("/transactions/", json={
+        "date": "2024-03-05", "type": "Expense", "person": "Bob",
+        "category": "Food", "description": "Lunch", "amount": 12.5,
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    stored = sqlite_db.get(Transaction, body["id"])
+    assert stored.date == date(2024, 3, 5)
+    assert stored.amount == 12.5
+    assert body == {
+        "date": "2024-03-05", "type": "Expense", "person": "Bob",
+        "category": "Food", "description": "Lunch", "amount": 12.5,
+        "id": stored.id, "user_id": sqlite_user.id,
+    }
+    assert sqlite_db.query(Transaction).count() == 1
+
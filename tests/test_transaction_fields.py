@@ -0,0 +1,38 @@
+"""
+Unit tests for the transaction schemas.
+These tests don't require Docker services to be running.
+"""
+
+import pytest
+from datetime import date
+from pydantic import ValidationError
+
+from app.models import TRANSACTION_TYPES
+from app.schemas import TransactionCreate
+
+
+def _transaction(**overrides):
+    data = {
+        "date": date(2024, 1, 15),
+        "type": "Expense",
+        "person": "Alice",
+        "category": "Groceries",
+        "description": "Weekly shop",
+        "amount": 42.5,
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.mark.parametrize("transaction_type", TRANSACTION_TYPES)
+def test_transaction_create_accepts_known_types(transaction_type):
+    transaction = TransactionCreate(**_transaction(type=transaction_type))
+    assert transaction.type == transaction_type
+
+
+@pytest.mark.parametrize("transaction_type", ["Bogus", "expense", ""])
+def test_transaction_create_rejects_unknown_type(transaction_type):
+    """An unknown type fails validation (422) instead of the DB check (500)"""
+    with pytest.raises(ValidationError) as exc_info:
+        TransactionCreate(**_transaction(type=transaction_type))
+    assert exc_info.value.errors()[0]["loc"] == ("type",)
@@ -0,0 +1,330 @@
+import io
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from sqlalchemy import select
+
+from app.cache import user_categories_cache, user_persons_cache
+from app.models import Category, Person, Transaction
+from app.routes import transactions
+from app.routes.transactions import _validate_df
+
+CSV_HEADER = "date,type,person,category,description,amount\n"
+
+
+def _csv_rows(dates):
+    return pd.DataFrame({
+        "date": dates,
+        "type": "Expense",
+        "person": "Alice",
+        "category": "Groceries",
+        "description": "Weekly shop",
+        "amount": "12.50",
+    })
+
+
+@pytest.mark.parametrize("dates,expected", [
+    pytest.param(
+        ["2024-01-01T00:00:00+01:00", "01/02/2024"],
+        [date(2024, 1, 1), date(2024, 1, 2)],
+        id="offset_and_non_iso"),
+    # Each row keeps its own wall-clock date, not the UTC one
+    pytest.param(
+        ["2024-01-01T00:30:00+01:00", "2024-03-01T23:30:00-05:00", "2024-04-05"],
+        [date(2024, 1, 1), date(2024, 3, 1), date(2024, 4, 5)],
+        id="mixed_offsets_and_plain_iso"),
+    pytest.param(
+        ["2024-05-06 10:00Z", "17/09/2024"],
+        [date(2024, 5, 6), date(2024, 9, 17)],
+        id="zulu_and_day_first"),
+])
+def test_validate_df_mixed_date_formats(dates, expected):
+    with warnings.catch_warnings():
+        # An object-dtype fallback used to announce itself with a FutureWarning
+        warnings.simplefilter("error", FutureWarning)
+        valid, errors = _validate_df(_csv_rows(dates))
+
+    assert errors == []
+    assert [row["date"] for row in valid] == expected
+
+
+def test_validate_df_reports_unparseable_dates():
+    valid, errors = _validate_df(_csv_rows(["2024-01-01T00:00:00+01:00", "bogus", ""]))
+
+    assert [row["date"] for row in valid] == [date(2024, 1, 1)]
+    assert errors == [
+        "Row 3: Invalid date format. Expected YYYY-MM-DD or similar parseable format",
+        "Row 4: Date is required",
+    ]
+
+
+MIXED_BAD_CSV = """date,type,person,category,description,amount
+2024-01-01,Expense,,Groceries,Weekly shop,12.50
+2024-01-02,Expense,Bob,,Rent,100
+2024-01-03, Expense ,Bob,Bills,Power,
+bogus,Refund,Bob,Bills,,abc
+2024-01-05,Income,  ,Salary,Pay,2000
+"""
+
+
+def test_validate_df_reports_every_error_in_order():
+    df = pd.read_csv(io.StringIO(MIXED_BAD_CSV))
+
+    valid, errors = _validate_df(df, first_row=10)
+
+    assert errors == [
+        "Row 11: Category is required",
+        "Row 12: Invalid type ' Expense '. Must be one of: Income, Expense, Investment, Savings",
+        "Row 12: Amount is required",
+        "Row 13: Invalid date format. Expected YYYY-MM-DD or similar parseable format",
+        "Row 13: Invalid type 'Refund'. Must be one of: Income, Expense, Investment, Savings",
+        "Row 13: Description is required",
+        "Row 13: Amount must be a valid number",
+    ]
+    # Blank and whitespace-only persons both default to Family
+    assert valid == [
+        {"date": date(2024, 1, 1), "type": "Expense", "person": "Family",
+         "category": "Groceries", "description": "Weekly shop", "amount": 12.5},
+        {"date": date(2024, 1, 5), "type": "Income", "person": "Family",
+         "category": "Salary", "description": "Pay", "amount": 2000.0},
+    ]
+
+
+def test_validate_df_defaults_person_without_column():
+    df = _csv_rows(["2024-01-01"]).drop(columns="person")
+
+    valid, errors = _validate_df(df)
+
+    assert errors == []
+    assert valid[0]["person"] == "Family"
+
+
+@pytest.mark.parametrize("dtype", [
+    object,
+    "string",
+    # The "str" dtype pandas 3 infers for text columns by default
+    pd.StringDtype(na_value=np.nan),
+], ids=str)
+@pytest.mark.parametrize("amounts,arrow_cast", [
+    # pyarrow casts the whole column in one go
+    pytest.param(["inf", "1e400", "nan", "12.5"], True, id="arrow_cast"),
+    # the padded value makes the cast fail, so pandas coerces per value
+    pytest.param(["inf", "1e400", "nan", " 12.5 "], False, id="pandas_coerce"),
+])
+def test_validate_df_rejects_non_finite_amounts(amounts, arrow_cast, dtype, monkeypatch):
+    if transactions.pacsv is None:
+        pytest.skip("pyarrow is not installed")
+    casts = []
+    arrow_compute_cast = transactions.pc.cast
+
+    def cast(*args):
+        # Record whether each arrow cast succeeded
+        casts.append(False)
+        result = arrow_compute_cast(*args)
+        casts[-1] = True
+        return result
+
+    monkeypatch.setattr(transactions, "pc", SimpleNamespace(cast=cast))
+    df = _csv_rows(["2024-01-01"] * 4)
+    df["amount"] = pd.Series(amounts, dtype=dtype)
+
+    valid, errors = _validate_df(df)
+
+    assert casts == [arrow_cast]
+    assert errors == [
+        "Row 2: Amount must be a valid number",
+        "Row 3: Amount must be a valid number",
+        "Row 4: Amount must be a valid number",
+    ]
+    assert [row["amount"] for row in valid] == [12.5]
+
+
+def _csv_lines(count):
+    return [f"2024-01-{day:02d},Expense,Bob,Food {day},Lunch,{day}.5\n"
+            for day in range(1, count + 1)]
+
+
+@pytest.fixture(params=["pandas", "pyarrow"])
+def chunked_import(request, monkeypatch):
+    """Force small import chunks on either CSV parser
+
+    Returns the first_row of every chunk _validate_df was called with.
+    """
+    if request.param == "pandas":
+        monkeypatch.setattr(transactions, "pacsv", None)
+        monkeypatch.setattr(transactions, "IMPORT_CHUNK_ROWS", 2)
+    else:
+        if transactions.pacsv is None:
+            pytest.skip("pyarrow is not installed")
+        monkeypatch.setattr(transactions, "IMPORT_BLOCK_BYTES", 96)
+
+    first_rows = []
+
+    def validate_df(df, first_row=2):
+        first_rows.append(first_row)
+        return _validate_df(df, first_row)
+
+    monkeypatch.setattr(transactions, "_validate_df", validate_df)
+    return first_rows
+
+
+def _import_csv(client, text):
+    return client.post("/transactions/import-csv",
+                       files={"file": ("import.csv", text, "text/csv")})
+
+
+def test_import_csv_rolls_back_on_error_in_later_chunk(
+        transactions_client, sqlite_db, chunked_import):
+    lines = _csv_lines(7)
+    lines[5] = "2024-01-06,Expense,Carol,Food 6,Lunch,abc\n"
+
+    response = _import_csv(transactions_client, CSV_HEADER + "".join(lines))
+
+    assert len(chunked_import) > 1
+    assert response.status_code == 400
+    assert response.json()["detail"] == {
+        "message": "CSV validation failed",
+        "errors": ["Row 7: Amount must be a valid number"],
+        "valid_rows": 6,
+        "total_rows": 7,
+    }
+    # Chunks stored before the bad one are rolled back with their names
+    assert sqlite_db.query(Transaction).count() == 0
+    assert sqlite_db.query(Category).count() == 0
+    assert sqlite_db.query(Person).count() == 0
+
+
+def test_import_csv_stores_every_chunk(transactions_client, sqlite_db, chunked_import):
+    response = _import_csv(transactions_client, CSV_HEADER + "".join(_csv_lines(7)))
+
+    assert len(chunked_import) > 1
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Successfully imported 7 transactions",
+        "imported_count": 7,
+        "total_rows": 7,
+    }
+    rows = sqlite_db.query(
+        Transaction.date, Transaction.category, Transaction.amount
+    ).order_by(Transaction.id).all()
+    assert rows == [(date(2024, 1, day), f"Food {day}", day + 0.5)
+                    for day in range(1, 8)]
+
+
+def test_import_csv_creates_each_new_name_once(
+        transactions_client, sqlite_db, sqlite_user, monkeypatch):
+    # Several INSERT batches per import
+    monkeypatch.setattr(transactions, "IMPORT_BATCH_SIZE", 2)
+    sqlite_db.add_all([Category(name="Food", user_id=sqlite_user.id),
+                       Person(name="Bob", user_id=sqlite_user.id)])
+    sqlite_db.commit()
+    # Cache the names as they were before the import
+    assert transactions_client.get("/transactions/categories").json() == ["Food"]
+    assert transactions_client.get("/transactions/persons").json() == ["Bob"]
+
+    response = _import_csv(transactions_client, CSV_HEADER + "".join([
+        "2024-01-01,Expense,Bob,Food,Lunch,1\n",
+        "2024-01-02,Expense,Alice,Travel,Train,2\n",
+        "2024-01-03,Expense,Alice,Food,Dinner,3\n",
+        "2024-01-04,Expense,Bob,Travel,Bus,4\n",
+        "2024-01-05,Expense,Alice,Travel,Taxi,5\n",
+    ]))
+
+    assert response.status_code == 200
+    assert sqlite_db.query(Transaction).count() == 5
+    assert sorted(sqlite_db.scalars(select(Category.name))) == ["Food", "Travel"]
+    assert sorted(sqlite_db.scalars(select(Person.name))) == ["Alice", "Bob"]
+    # The pre-import names are no longer cached
+    assert user_categories_cache.get(sqlite_user.id) is None
+    assert user_persons_cache.get(sqlite_user.id) is None
+    assert transactions_client.get("/transactions/categories").json() == ["Food", "Travel"]
+    assert transactions_client.get("/transactions/persons").json() == ["Bob", "Alice"]
+
+
+def _preview_csv(client, text):
+    return client.post("/transactions/preview-csv",
+                       files={"file": ("preview.csv", text, "text/csv")})
+
+
+def test_preview_csv_within_limits(transactions_client):
+    response = _preview_csv(transactions_client, CSV_HEADER + "".join(_csv_lines(3)))
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["total_rows"], body["preview_rows"], body["valid_count"],
+            body["error_count"], body["truncated"]) == (3, 3, 3, 0, False)
+    assert body["valid_transactions"][0]["date"] == "2024-01-01"
+
+
+def test_preview_csv_caps_rows(transactions_client, monkeypatch):
+    monkeypatch.setattr(transactions, "PREVIEW_MAX_ROWS", 3)
+    lines = _csv_lines(7)
+    # A bad row past the cap is neither validated nor reported
+    lines[5] = "2024-01-06,Expense,Carol,Food 6,Lunch,abc\n"
+
+    response = _preview_csv(transactions_client, CSV_HEADER + "".join(lines))
+
+    body = response.json()
+    assert (body["total_rows"], body["preview_rows"], body["valid_count"],
+            body["error_count"], body["truncated"]) == (7, 3, 3, 0, True)
+    assert len(body["valid_transactions"]) == 3
+
+
+def test_preview_csv_caps_errors(transactions_client, monkeypatch):
+    monkeypatch.setattr(transactions, "PREVIEW_MAX_ERRORS", 2)
+    lines = [line.replace("Lunch", "") for line in _csv_lines(4)]
+    lines[0] = _csv_lines(1)[0]
+
+    response = _preview_csv(transactions_client, CSV_HEADER + "".join(lines))
+
+    body = response.json()
+    assert body["errors"] == ["Row 3: Description is required",
+                              "Row 4: Description is required"]
+    assert (body["total_rows"], body["preview_rows"], body["valid_count"],
+            body["error_count"], body["truncated"]) == (4, 4, 1, 3, True)
+
+
+@pytest.mark.parametrize("parser", ["pandas", "pyarrow"])
+def test_count_csv_rows(parser, monkeypatch):
+    if parser == "pandas":
+        monkeypatch.setattr(transactions, "pacsv", None)
+    elif transactions.pacsv is None:
+        pytest.skip("pyarrow is not installed")
+    text = CSV_HEADER + "".join(_csv_lines(3)) + \
+        '2024-01-04,Expense,Bob,Food,"Two\nlines",1\n'
+
+    assert transactions.count_csv_rows(io.BytesIO(text.encode())) == 4
+
+
+@pytest.mark.parametrize("path", ["/transactions/import-csv", "/transactions/preview-csv"])
+@pytest.mark.parametrize("text,detail", [
+    pytest.param("", "CSV file is empty", id="empty"),
+    pytest.param("date,type,person,category,description\n"
+                 "2024-01-01,Expense,Bob,Food,Lunch\n",
+                 "Missing required columns: amount", id="missing_column"),
+])
+def test_csv_header_rejected(transactions_client, sqlite_db, path, text, detail):
+    response = transactions_client.post(
+        path, files={"file": ("bad.csv", text, "text/csv")})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    assert sqlite_db.query(Transaction).count() == 0
+
+
+@pytest.mark.parametrize("path", ["/transactions/import-csv", "/transactions/preview-csv"])
+def test_csv_header_rejects_unexpected_column(transactions_client, path):
+    text = CSV_HEADER.rstrip("\n") + ",notes\n" + _csv_lines(1)[0].rstrip("\n") + ",x\n"
+
+    response = transactions_client.post(
+        path, files={"file": ("extra.csv", text, "text/csv")})
+
+    assert response.status_code == 400
+    found, expected = response.json()["detail"].split(". Expected columns: ")
+    assert found == "Unexpected columns found: notes"
+    # Column sets have no fixed order
+    assert set(expected.split(", ")) == {
+        "date", "type", "person", "category", "description", "amount"}
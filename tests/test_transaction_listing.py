@@ -0,0 +1,145 @@
+"""
+Tests for listing transactions through GET /transactions/.
+They run against an in-memory SQLite database, without Docker services.
+"""
+
+import pytest
+from datetime import date
+from pydantic import TypeAdapter
+
+from app.models import Transaction
+from app.schemas import Transaction as TransactionSchema
+from app.routes import transactions
+from app.routes.transactions import _escape_like
+
+# (date, amount, description); ids follow this order, from 1
+ROWS = [
+    (date(2024, 1, 1), 10.0, "Coffee"),
+    (date(2024, 1, 2), 30.0, "Books"),
+    (date(2024, 1, 2), 20.0, "Lunch"),
+    (date(2024, 1, 2), 50.0, "Train"),
+    (date(2024, 1, 3), 40.0, "Dinner"),
+]
+
+# The listing is rendered straight from rows, bypassing response_model
+TRANSACTION_LIST = TypeAdapter(list[TransactionSchema])
+
+
+@pytest.fixture
+def stored(sqlite_db, sqlite_user):
+    """Store ROWS for sqlite_user"""
+    sqlite_db.add_all([
+        Transaction(date=day, type="Expense", person="Family",
+                    category="Food", description=description,
+                    amount=amount, user_id=sqlite_user.id)
+        for day, amount, description in ROWS
+    ])
+    sqlite_db.commit()
+
+
+def _ids(client, **params):
+    response = client.get("/transactions/", params=params)
+    assert response.status_code == 200
+    return [row["id"] for row in response.json()]
+
+
+@pytest.mark.usefixtures("stored")
+@pytest.mark.parametrize("params,expected", [
+    pytest.param({}, [5, 4, 3, 2, 1], id="unpaginated"),
+    # Equal dates fall back to id, in the same direction
+    pytest.param({"page": 1, "per_page": 2}, [5, 4], id="first_page"),
+    pytest.param({"page": 2, "per_page": 2}, [3, 2], id="second_page"),
+    pytest.param({"page": 3, "per_page": 2}, [1], id="last_page"),
+    pytest.param({"page": 4, "per_page": 2}, [], id="past_the_end"),
+    pytest.param({"page": 2, "per_page": 2, "sort_direction": "asc"}, [3, 4],
+                 id="ascending"),
+    pytest.param({"page": 2}, [], id="default_per_page"),
+    pytest.param({"per_page": 3}, [5, 4, 3], id="default_page"),
+    pytest.param({"page": 0, "per_page": 1}, [5], id="page_below_one"),
+    pytest.param({"page": 2, "per_page": 0}, [4], id="per_page_below_one"),
+    pytest.param({"page": 1, "per_page": -5}, [5], id="negative_per_page"),
+])
+def test_get_transactions_pages(transactions_client, params, expected):
+    assert _ids(transactions_client, **params) == expected
+
+
+@pytest.mark.usefixtures("stored")
+def test_get_transactions_clamps_per_page(transactions_client, monkeypatch):
+    monkeypatch.setattr(transactions, "MAX_PER_PAGE", 2)
+
+    assert _ids(transactions_client, page=1, per_page=5000) == [5, 4]
+    assert _ids(transactions_client, page=3, per_page=5000) == [1]
+
+
+@pytest.mark.usefixtures("stored")
+@pytest.mark.parametrize("sort_by,direction,expected", [
+    ("amount", "asc", [1, 3, 2, 5, 4]),
+    ("amount", "desc", [4, 5, 2, 3, 1]),
+    ("description", "asc", [2, 1, 5, 3, 4]),
+    # Equal categories fall back to id
+    ("category", "asc", [1, 2, 3, 4, 5]),
+    ("date", "asc", [1, 2, 3, 4, 5]),
+    # Unknown columns sort by date instead of failing
+    ("bogus", "desc", [5, 4, 3, 2, 1]),
+    ("__class__", "desc", [5, 4, 3, 2, 1]),
+])
+def test_get_transactions_sorts(transactions_client, sort_by, direction, expected):
+    assert _ids(transactions_client, sort_by=sort_by,
+                sort_direction=direction) == expected
+
+
+@pytest.mark.parametrize("term,expected", [
+    ("coffee", "coffee"),
+    ("50%", "50\\%"),
+    ("a_b", "a\\_b"),
+    ("C:\\tmp", "C:\\\\tmp"),
+    # A literal backslash and the wildcard after it are escaped separately
+    ("\\%", "\\\\\\%"),
+])
+def test_escape_like(term, expected):
+    assert _escape_like(term) == expected
+
+
+@pytest.mark.parametrize("description,expected", [
+    ("50%", ["50% off"]),
+    ("a_b", ["a_b"]),
+    ("\\", ["back\\slash"]),
+    # Matching stays case-insensitive
+    ("OFF", ["50% off", "500 off"]),
+])
+def test_get_transactions_filters_description_literally(
+        transactions_client, sqlite_db, sqlite_user, description, expected):
+    sqlite_db.add_all([
+        Transaction(date=date(2024, 1, 1), type="Expense", person="Family",
+                    category="Food", description=text, amount=1.0,
+                    user_id=sqlite_user.id)
+        for text in ["50% off", "500 off", "a_b", "axb", "back\\slash"]
+    ])
+    sqlite_db.commit()
+
+    response = transactions_client.get(
+        "/transactions/", params={"description": description, "sort_by": "description",
+                                  "sort_direction": "asc"})
+
+    assert [row["description"] for row in response.json()] == expected
+
+
+@pytest.mark.usefixtures("stored")
+def test_get_transactions_matches_schema(transactions_client, sqlite_user):
+    response = transactions_client.get("/transactions/", params={"sort_direction": "asc"})
+
+    payload = response.json()
+    # Same keys, in schema order, as response_model would have produced
+    assert [list(row) for row in payload] == [list(TransactionSchema.model_fields)] * len(ROWS)
+    assert payload[0] == {
+        "date": "2024-01-01", "type": "Expense", "person": "Family",
+        "category": "Food", "description": "Coffee", "amount": 10.0,
+        "id": 1, "user_id": sqlite_user.id,
+    }
+    assert all(isinstance(row["amount"], float) for row in payload)
+    assert TRANSACTION_LIST.validate_python(payload) == [
+        TransactionSchema(date=day, type="Expense", person="Family",
+                          category="Food", description=description,
+                          amount=amount, id=row_id, user_id=sqlite_user.id)
+        for row_id, (day, amount, description) in enumerate(ROWS, start=1)
+    ]